@@ -51,8 +51,7 @@ def build_all():
         configs_folder / 'tiny_fortran/build_tiny_fortran.py',
 
         configs_folder / 'gcom/grab_gcom.py',
-        configs_folder / 'gcom/build_gcom_ar.py',
-        configs_folder / 'gcom/build_gcom_so.py',
+        configs_folder / 'gcom/build_gcom_all.py',
 
         configs_folder / 'jules/build_jules.py',
 
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+##############################################################################
+# (c) Crown copyright Met Office. All rights reserved.
+# For further details please refer to the file COPYRIGHT
+# which you should have received as part of this distribution
+##############################################################################
+
+"""
+Build both the gcom object archive and shared library in one process.
+
+"""
+
+from gcom_build_steps import build_gcom
+
+
+if __name__ == '__main__':
+
+    build_gcom('ar')
+    build_gcom('so')
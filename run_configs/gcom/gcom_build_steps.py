@@ -4,8 +4,12 @@
 # which you should have received as part of this distribution
 ##############################################################################
 
-from fab.api import (analyse, compile_c, compile_fortran, find_source_files,
-                     grab_folder, preprocess_c, preprocess_fortran)
+from typing import Literal
+
+from fab.api import (analyse, archive_objects, BuildConfig, cleanup_prebuilds,
+                     compile_c, compile_fortran, find_source_files,
+                     grab_folder, link_shared_object, preprocess_c,
+                     preprocess_fortran, ToolBox)
 
 from grab_gcom import grab_config
 
@@ -30,3 +34,29 @@ def common_build_steps(config, fpic=False):
     analyse(config),
     compile_c(config, common_flags=['-c', '-std=c99'] + fpic),
     compile_fortran(config, common_flags=fpic),
+
+
+def build_gcom(kind: Literal['ar', 'so']):
+    """
+    Build gcom as an object archive ('ar') or a shared library ('so').
+
+    Both build scripts delegate to this function, so that both outputs
+    can be built from a single Python process, see `build_gcom_all.py`.
+
+    """
+    if kind == 'ar':
+        project_label = 'gcom object archive $compiler'
+    elif kind == 'so':
+        project_label = 'gcom shared library $compiler'
+    else:
+        raise ValueError(f"unknown gcom build kind: '{kind}'")
+
+    with BuildConfig(project_label=project_label,
+                     mpi=True, openmp=False, tool_box=ToolBox()) as state:
+        if kind == 'ar':
+            common_build_steps(state)
+            archive_objects(state, output_fpath='$output/libgcom.a')
+        else:
+            common_build_steps(state, fpic=True)
+            link_shared_object(state, output_fpath='$output/libgcom.so')
+        cleanup_prebuilds(state, all_unused=True)
@@ -85,8 +85,9 @@ if __name__ == '__main__':
                 '-Wall', '-Werror=conversion', '-Werror=unused-variable', '-Werror=character-truncation',
                 '-Werror=unused-value', '-Werror=tabs',
 
-                '-DRDEF_PRECISION=64', '-DR_SOLVER_PRECISION=64', '-DR_TRAN_PRECISION=64',
-                '-DUSE_XIOS', '-DUSE_MPI=YES',
+                # The precision and XIOS defines have already been expanded
+                # by preprocess_fortran.
+                '-DUSE_MPI=YES',
             ],
         )
 
@@ -99,4 +100,5 @@ if __name__ == '__main__':
                 '-lxios',  # EXTERNAL_STATIC_LIBRARIES
                 '-lstdc++',
             ],
+            use_response_file=True,
         )
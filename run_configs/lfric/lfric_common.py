@@ -1,6 +1,8 @@
 import logging
 import os
-from typing import Optional
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from functools import lru_cache
+from typing import FrozenSet, Optional
 from pathlib import Path
 
 from fab.api import BuildConfig, Category, find_source_files, step, Tool
@@ -22,6 +24,14 @@ class Script(Tool):
         return True
 
 
+@lru_cache(maxsize=None)
+def _get_script(path: Path) -> Script:
+    ''':returns: the Script for the given path, which is only created once
+        even if the configurator is run several times.
+    '''
+    return Script(path)
+
+
 # ============================================================================
 @step
 def configurator(config, lfric_source: Path, gpl_utils_source: Path,
@@ -34,16 +44,19 @@ def configurator(config, lfric_source: Path, gpl_utils_source: Path,
     config_dir = config_dir or config.source_root / 'configuration'
     config_dir.mkdir(parents=True, exist_ok=True)
 
-    env = os.environ.copy()
+    # The tools need the rose/lfric python libraries, and PYTHONPATH might
+    # not be set at all. The same environment is used for all tools.
     rose_lfric_path = gpl_utils_source / 'lib/python'
-    env['PYTHONPATH'] += f':{rose_lfric_path}'
+    python_path = os.pathsep.join(filter(None, [os.environ.get('PYTHONPATH'),
+                                                str(rose_lfric_path)]))
+    env = {**os.environ, 'PYTHONPATH': python_path}
 
     # rose picker
     # -----------
     # creates rose-meta.json and config_namelists.txt in
     # gungho/build
-    logger.info('rose_picker')
-    rose_picker = Script(rose_picker_tool)
+    logger.debug('rose_picker')
+    rose_picker = _get_script(rose_picker_tool)
     rose_picker.run(additional_parameters=[rose_meta_conf,
                                            '-directory', config_dir,
                                            '-include_dirs', lfric_source],
@@ -53,34 +66,69 @@ def configurator(config, lfric_source: Path, gpl_utils_source: Path,
     # build_config_loaders
     # --------------------
     # builds a bunch of f90s from the json
-    logger.info('GenerateNamelist')
-    gen_namelist = Script(gen_namelist_tool)
+    logger.debug('GenerateNamelist')
+    gen_namelist = _get_script(gen_namelist_tool)
     gen_namelist.run(additional_parameters=['-verbose', rose_meta,
                                             '-directory', config_dir],
-                     cwd=config_dir)
+                     env=env, cwd=config_dir)
+
+    # The loader and the feigns are generated from the outputs above and
+    # write different files, so both tools can run at the same time.
 
     # create configuration_mod.f90 in source root
     # -------------------------------------------
-    logger.info('GenerateLoader')
-    names = [name.strip() for name in
-             open(config_dir / 'config_namelists.txt').readlines()]
+    logger.debug('GenerateLoader')
+    with open(config_dir / 'config_namelists.txt') as namelists_file:
+        names = [name for line in namelists_file for name in line.split()]
     configuration_mod_fpath = config_dir / 'configuration_mod.f90'
-    gen_loader = Script(gen_loader_tool)
-    gen_loader.run(additional_parameters=[configuration_mod_fpath,
-                                          *names])
+    gen_loader = _get_script(gen_loader_tool)
 
     # create feign_config_mod.f90 in source root
     # ------------------------------------------
-    logger.info('GenerateFeigns')
+    logger.debug('GenerateFeigns')
     feign_config_mod_fpath = config_dir / 'feign_config_mod.f90'
-    gft = Script(gen_feigns_tool)
-    gft.run(additional_parameters=[rose_meta,
-                                   '-output', feign_config_mod_fpath])
+    gft = _get_script(gen_feigns_tool)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(gen_loader.run,
+                        additional_parameters=[configuration_mod_fpath,
+                                               *names],
+                        env=env),
+            pool.submit(gft.run,
+                        additional_parameters=[rose_meta,
+                                               '-output',
+                                               feign_config_mod_fpath],
+                        env=env),
+        ]
+        # Re-raise any error from the tools
+        for future in as_completed(futures):
+            future.result()
 
     find_source_files(config, source_root=config_dir)
 
 
 # ============================================================================
+@lru_cache(maxsize=None)
+def _directory_entries(directory: Path) -> FrozenSet[str]:
+    ''':returns: the names of all entries in the given directory, or an
+        empty set if the directory does not exist. The result is cached, so
+        each optimisation directory is only listed once, instead of testing
+        for the existence of a script for every single PSyclone file.
+    '''
+    try:
+        return frozenset(entry.name for entry in os.scandir(directory))
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
+def _script_exists(script: Path) -> bool:
+    ''':returns: whether the given script exists, using the cached
+        directory listing.
+    '''
+    return script.name in _directory_entries(script.parent)
+
+
 def get_transformation_script(fpath: Path,
                               config: BuildConfig) -> Optional[Path]:
     ''':returns: the transformation script to be used by PSyclone.
@@ -89,17 +137,16 @@ def get_transformation_script(fpath: Path,
     optimisation_path = config.source_root / 'optimisation' / 'meto-spice'
     relative_path = None
     for base_path in [config.source_root, config.build_output]:
-        try:
+        if fpath.is_relative_to(base_path):
             relative_path = fpath.relative_to(base_path)
-        except ValueError:
-            pass
+            break
     if relative_path:
         local_transformation_script = (optimisation_path /
                                        (relative_path.with_suffix('.py')))
-        if local_transformation_script.exists():
+        if _script_exists(local_transformation_script):
             return local_transformation_script
 
     global_transformation_script = optimisation_path / 'global.py'
-    if global_transformation_script.exists():
+    if _script_exists(global_transformation_script):
         return global_transformation_script
     return None
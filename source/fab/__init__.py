@@ -13,8 +13,11 @@ import sys
 __version__ = '2.1.dev.1'
 
 logger = logging.getLogger(__name__)
-logger.addHandler(logging.StreamHandler(sys.stdout))
-logger.setLevel(logging.INFO)
+# Only add the console handler once, even if this module is reloaded
+# (e.g. by an interactive session or a test runner).
+if not logger.handlers:
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    logger.setLevel(logging.INFO)
 
 
 class FabException(Exception):
@@ -2,42 +2,123 @@
 This module allows any application to import all required
 functions from fab to be imported independent of the location of the
 files using `from fab.api import ...`.
+
+The symbols are imported lazily (see PEP 562): a submodule is only
+imported the first time one of its symbols is accessed, so a small build
+script does not pay for importing every step and tool in Fab.
 """
 
 # TODO #518: allow versioned APIs, and make this file point to the
 # current default API version.
 
-from fab.artefacts import ArtefactSet, CollectionGetter
-from fab.artefacts import SuffixFilter
-from fab.build_config import AddFlags, BuildConfig
-from fab.steps import run_mp
-from fab.steps import step
-from fab.steps.analyse import analyse
-from fab.steps.archive_objects import archive_objects
-from fab.steps.c_pragma_injector import c_pragma_injector
-from fab.steps.cleanup_prebuilds import cleanup_prebuilds
-from fab.steps.compile_c import compile_c
-from fab.steps.compile_fortran import compile_fortran
-from fab.steps.find_source_files import Exclude, find_source_files, Include
-from fab.steps.grab.fcm import fcm_export
-from fab.steps.grab.folder import grab_folder
-from fab.steps.grab.git import git_checkout
-from fab.steps.grab.prebuild import grab_pre_build
-from fab.steps.link import link_exe, link_shared_object
-from fab.steps.preprocess import preprocess_c, preprocess_fortran
-from fab.steps.psyclone import preprocess_x90, psyclone
-from fab.steps.root_inc_files import root_inc_files
-from fab.tools.category import Category
-from fab.tools.compiler import Compiler, Ifort
-from fab.tools.compiler_wrapper import CompilerWrapper
-from fab.tools.linker import Linker
-from fab.tools.tool import Tool
-from fab.tools.tool_box import ToolBox
-from fab.tools.tool_repository import ToolRepository
-from fab.util import common_arg_parser
-from fab.util import file_checksum, log_or_dot, TimerLogger
-from fab.util import get_fab_workspace
-from fab.util import input_to_output_fpath
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    # Static type checkers do not evaluate __getattr__, so give them the
+    # real imports.
+    from fab.artefacts import ArtefactSet, CollectionGetter
+    from fab.artefacts import SuffixFilter
+    from fab.build_config import AddFlags, BuildConfig
+    from fab.steps import run_mp
+    from fab.steps import cached_step, step
+    from fab.steps.analyse import analyse
+    from fab.steps.archive_objects import archive_objects
+    from fab.steps.c_pragma_injector import c_pragma_injector
+    from fab.steps.cleanup_prebuilds import cleanup_prebuilds
+    from fab.steps.compile_c import compile_c
+    from fab.steps.compile_fortran import compile_fortran
+    from fab.steps.find_source_files import (Exclude, find_source_files,
+                                             Include)
+    from fab.steps.grab.fcm import fcm_export
+    from fab.steps.grab.folder import grab_folder
+    from fab.steps.grab.git import git_checkout
+    from fab.steps.grab.prebuild import grab_pre_build
+    from fab.steps.link import link_exe, link_shared_object
+    from fab.steps.preprocess import preprocess_c, preprocess_fortran
+    from fab.steps.psyclone import preprocess_x90, psyclone
+    from fab.steps.root_inc_files import root_inc_files
+    from fab.tools.category import Category
+    from fab.tools.compiler import Compiler, Ifort
+    from fab.tools.compiler_wrapper import CompilerWrapper
+    from fab.tools.linker import Linker
+    from fab.tools.tool import Tool
+    from fab.tools.tool_box import ToolBox
+    from fab.tools.tool_repository import ToolRepository
+    from fab.util import common_arg_parser
+    from fab.util import file_checksum, log_or_dot, TimerLogger
+    from fab.util import get_fab_workspace
+    from fab.util import input_to_output_fpath
+
+# Maps each exported symbol to the module that defines it.
+_LAZY_IMPORTS: Dict[str, str] = {
+    "AddFlags": "fab.build_config",
+    "analyse": "fab.steps.analyse",
+    "archive_objects": "fab.steps.archive_objects",
+    "ArtefactSet": "fab.artefacts",
+    "BuildConfig": "fab.build_config",
+    "Category": "fab.tools.category",
+    "cleanup_prebuilds": "fab.steps.cleanup_prebuilds",
+    "CollectionGetter": "fab.artefacts",
+    "common_arg_parser": "fab.util",
+    "Compiler": "fab.tools.compiler",
+    "CompilerWrapper": "fab.tools.compiler_wrapper",
+    "compile_c": "fab.steps.compile_c",
+    "compile_fortran": "fab.steps.compile_fortran",
+    "cached_step": "fab.steps",
+    "c_pragma_injector": "fab.steps.c_pragma_injector",
+    "Exclude": "fab.steps.find_source_files",
+    "fcm_export": "fab.steps.grab.fcm",
+    "file_checksum": "fab.util",
+    "get_fab_workspace": "fab.util",
+    "git_checkout": "fab.steps.grab.git",
+    "grab_folder": "fab.steps.grab.folder",
+    "grab_pre_build": "fab.steps.grab.prebuild",
+    "find_source_files": "fab.steps.find_source_files",
+    "Ifort": "fab.tools.compiler",
+    "Include": "fab.steps.find_source_files",
+    "input_to_output_fpath": "fab.util",
+    "Linker": "fab.tools.linker",
+    "link_exe": "fab.steps.link",
+    "link_shared_object": "fab.steps.link",
+    "log_or_dot": "fab.util",
+    "preprocess_c": "fab.steps.preprocess",
+    "preprocess_fortran": "fab.steps.preprocess",
+    "preprocess_x90": "fab.steps.psyclone",
+    "psyclone": "fab.steps.psyclone",
+    "root_inc_files": "fab.steps.root_inc_files",
+    "run_mp": "fab.steps",
+    "step": "fab.steps",
+    "SuffixFilter": "fab.artefacts",
+    "TimerLogger": "fab.util",
+    "Tool": "fab.tools.tool",
+    "ToolBox": "fab.tools.tool_box",
+    "ToolRepository": "fab.tools.tool_repository",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the requested symbol from its defining module on first access,
+    and store it in this module so that later accesses are plain lookups.
+
+    :param name: the name of the symbol to import.
+
+    :raises AttributeError: if the name is not part of the API.
+    """
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module '{__name__}' has no attribute '{name}'") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "AddFlags",
@@ -53,6 +134,7 @@ __all__ = [
     "CompilerWrapper",
     "compile_c",
     "compile_fortran",
+    "cached_step",
     "c_pragma_injector",
     "Exclude",
     "fcm_export",
@@ -21,9 +21,10 @@ from string import Template
 from typing import List, Optional, Iterable
 
 from fab.artefacts import ArtefactSet, ArtefactStore
-from fab.constants import BUILD_OUTPUT, SOURCE_ROOT, PREBUILD
+from fab.constants import BUILD_OUTPUT, SOURCE_ROOT, PREBUILD, STEP_CACHE
 from fab.metrics import (send_metric, init_metrics, stop_metrics,
                          metrics_summary)
+from fab.step_cache import StepCache
 from fab.tools.category import Category
 from fab.tools.abstract_tool_box import AbstractToolBox
 from fab.steps.cleanup_prebuilds import CLEANUP_COUNT, cleanup_prebuilds
@@ -50,7 +51,8 @@ class BuildConfig():
                  reuse_artefacts: bool = False,
                  fab_workspace: Optional[Path] = None,
                  two_stage: bool = False,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 cache_steps: bool = False):
         """
         :param project_label:
             Name of the build project. The project workspace folder is
@@ -84,6 +86,10 @@ class BuildConfig():
             in some projects.
         :param verbose:
             DEBUG level logging.
+        :param cache_steps:
+            Skip cacheable steps (e.g. preprocessing and analysis) when
+            their arguments and input artefacts are unchanged since a
+            previous run, restoring their output artefacts instead.
 
         """
         self._tool_box = tool_box
@@ -144,6 +150,10 @@ class BuildConfig():
 
         self.reuse_artefacts = reuse_artefacts
 
+        self.step_cache: Optional[StepCache] = None
+        if cache_steps:
+            self.step_cache = StepCache(self.project_workspace / STEP_CACHE)
+
         # todo: should probably pull the artefact store out of the config
         # runtime
         self._artefact_store = ArtefactStore()
@@ -178,6 +188,9 @@ class BuildConfig():
                             "default hard cleanup")
                 cleanup_prebuilds(config=self, all_unused=True)
 
+        if self.step_cache:
+            self.step_cache.save()
+
         logger.info(f"Building '{self.project_label}' took "
                     f"{datetime.now() - self._start_time}")
 
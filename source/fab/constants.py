@@ -14,3 +14,6 @@ BUILD_OUTPUT = "build_output"
 
 # prebuild folder name
 PREBUILD = '_prebuild'
+
+# step cache folder name, underneath the project workspace
+STEP_CACHE = '_step_cache'
@@ -13,7 +13,7 @@ from importlib.util import module_from_spec, spec_from_loader
 from importlib.machinery import SourceFileLoader
 from pathlib import Path
 from types import ModuleType
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 from .arguments import FabArgumentParser
@@ -28,25 +28,44 @@ ARGUMENT_METHOD = "add_arguments"
 CHECK_METHOD = "check_arguments"
 
 
+# Modules already loaded by import_from_path, together with the
+# modification time of the file they were loaded from
+_MODULE_CACHE: Dict[Path, Tuple[int, ModuleType]] = {}
+
+
 def import_from_path(module_name: str, file_path: Path) -> Optional[ModuleType]:
-    """Load a module by file path."""
+    """Load a module by file path.
+
+    If the file has already been loaded and has not been modified since,
+    the previously loaded module is returned.
+    """
+    mtime = file_path.stat().st_mtime_ns
+    cached = _MODULE_CACHE.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        sys.modules[module_name] = cached[1]
+        return cached[1]
+
     # Temporarily disable bytecode genearation to prevent __pycache__
-    # directories from being created in the current working directory
+    # directories from being created in the current working directory.
+    # Repeated loads within a process are served from _MODULE_CACHE.
     bytecode_setting = sys.dont_write_bytecode
     sys.dont_write_bytecode = True
 
-    loader = SourceFileLoader(module_name, str(file_path))
-    spec = spec_from_loader(module_name, loader)
-    if spec is None or spec.loader is None:
-        # Unable to find the file for some reason
-        return None
-
-    module = module_from_spec(spec)
-    sys.modules[module_name] = module
-    spec.loader.exec_module(module)
-
-    # Restore previous bytecode generation setting
-    sys.dont_write_bytecode = bytecode_setting
+    try:
+        loader = SourceFileLoader(module_name, str(file_path))
+        spec = spec_from_loader(module_name, loader)
+        if spec is None or spec.loader is None:
+            # Unable to find the file for some reason
+            return None
+
+        module = module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    finally:
+        # Restore previous bytecode generation setting
+        sys.dont_write_bytecode = bytecode_setting
+
+    _MODULE_CACHE[file_path] = (mtime, module)
     return module
 
 
@@ -20,8 +20,9 @@ argument and adds its own arguments.
 
 import argparse
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable
+from typing import AbstractSet, Callable, Optional
 
 from ..util import get_fab_workspace
 from .. import __version__ as fab_version
@@ -31,15 +32,32 @@ from ..logtools import setup_logging
 def full_path_type(opt: str) -> Path:
     """Path with expanded usernames and resolved symlinks.
 
+    The same options tend to be resolved several times, e.g. by a two
+    phase parse, so the results are cached.  The current working
+    directory is part of the cache key because it affects the result
+    for relative paths.
+
     :param str opt: command line option
     :return: a fully resolved Path instance
     """
 
-    return Path(opt).expanduser().resolve()
+    return _resolve_path(opt, os.getcwd())
+
 
+@lru_cache(maxsize=256)
+def _resolve_path(opt: str, cwd: str) -> Path:
+    """Cached implementation of :func:`full_path_type`.
 
-def _parser_wrapper(func: Callable) -> Callable:
-    """Decorator to wrap arguments and checks.
+    :param str opt: command line option
+    :param str cwd: current working directory
+    :return: a fully resolved Path instance
+    """
+
+    return Path(os.path.realpath(os.path.expanduser(opt)))
+
+
+def _wrap_ns(func: Callable) -> Callable:
+    """Decorator to wrap arguments and checks around parse_args.
 
     Decorator which ensures some arguments are added before the first
     of any main parser calls because they can potentially be called
@@ -49,35 +67,37 @@ def _parser_wrapper(func: Callable) -> Callable:
     Always run some Namespace checks after the options have been
     parsed and then return the results.
 
+    The wrapped function must return a Namespace.  See
+    :func:`_wrap_known` for functions which return a tuple.
+
     The decorator exists outside the class to avoid problems with
     staticmethods in python < 3.10.
     """
 
     def inner(self, *args, **kwargs):
 
-        if self._setup_needed:
-            # Carry out setup actions needed only once
-            self._setup_needed = False
-            self._add_location_group()
-            self._add_output_group()
-            self._add_info_group()
+        self._setup_parser()
+        namespace = func(self, *args, **kwargs)
+        self._check_namespace(namespace)
 
-        result = func(self, *args, **kwargs)
+        return namespace
 
-        if isinstance(result, argparse.Namespace):
-            # parse_args
-            namespace = result
-        elif isinstance(result, tuple) and isinstance(result[0], argparse.Namespace):
-            # parse_known_args
-            namespace = result[0]
-        else:
-            raise ValueError("invalid return value from wrapped function")
+    return inner
 
-        # Save the name used to refer to the current program
-        namespace._progname = self.prog
 
-        self._check_fabfile(namespace)
-        self._configure_logging(namespace)
+def _wrap_known(func: Callable) -> Callable:
+    """Decorator to wrap arguments and checks around parse_known_args.
+
+    This is the same as :func:`_wrap_ns`, but the wrapped function
+    must return a tuple containing a Namespace and a list of the
+    remaining arguments.
+    """
+
+    def inner(self, *args, **kwargs):
+
+        self._setup_parser()
+        result = func(self, *args, **kwargs)
+        self._check_namespace(result[0])
 
         return result
 
@@ -87,7 +107,7 @@ def _parser_wrapper(func: Callable) -> Callable:
 class FabArgumentParser(argparse.ArgumentParser):
     """Fab command argument parser."""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, **kwargs) -> None:
 
         self.version = kwargs.pop("version", str(fab_version))
         self.fabfile = full_path_type(kwargs.pop("fabfile", "FabFile") or "FabFile")
@@ -105,6 +125,34 @@ class FabArgumentParser(argparse.ArgumentParser):
 
         self._have_logging = False
         self._setup_needed = True
+        self._fabfile_exists: Optional[bool] = None
+        self._file_only_parser: Optional[argparse.ArgumentParser] = None
+
+    def _setup_parser(self) -> None:
+        """Add the default arguments before the first parse."""
+
+        if self._setup_needed:
+            # Carry out setup actions needed only once
+            self._setup_needed = False
+            # Options defined by the user take precedence over the
+            # defaults.  The location group options are always added.
+            existing = frozenset(self._option_string_actions)
+            self._add_location_group()
+            self._add_output_group(existing)
+            self._add_info_group(existing)
+
+    def _check_namespace(self, namespace: argparse.Namespace) -> None:
+        """Check and complete the parsed arguments.
+
+        :param namespace: parsed command line arguments
+        """
+
+        # Save the name used to refer to the current program
+        namespace._progname = self.prog
+
+        self._check_fabfile(namespace)
+        self._check_workspace(namespace)
+        self._configure_logging(namespace)
 
     def _add_location_group(self):
         """Add project, workspace, and fabfile args."""
@@ -120,60 +168,39 @@ class FabArgumentParser(argparse.ArgumentParser):
             "--workspace",
             type=full_path_type,
             metavar="DIR",
-            default=get_fab_workspace().expanduser().resolve(),
-            help="location of working space (default: %(default)s)",
+            help="location of working space "
+            "(default: $FAB_WORKSPACE or ./fab-workspace)",
         )
 
-    def _add_output_group(self):
-        """Add output arguments if not present."""
+    def _add_output_group(self, existing: AbstractSet[str]):
+        """Add output arguments if not present.
+
+        :param existing: option strings which are already defined
+        """
 
         # Create an output group
         group = self.add_argument_group("fab output arguments")
 
-        if (
-            "--debug" not in self._option_string_actions
-            and "-d" not in self._option_string_actions
+        for short, long, action, help_text in (
+            ("-d", "--debug", "count", "increase the amount of fab debug output"),
+            ("-v", "--verbose", "count", "increase the amount of build output"),
+            # Add a quiet option to suppress all/most output
+            ("-q", "--quiet", "store_true", "do not produce much output"),
         ):
-            # Add a logging option
-            group.add_argument(
-                "-d",
-                "--debug",
-                action="count",
-                help="increase the amount of fab debug output",
-            )
+            if short not in existing and long not in existing:
+                # Add a logging option
+                group.add_argument(short, long, action=action, help=help_text)
 
-        if (
-            "--verbose" not in self._option_string_actions
-            and "-v" not in self._option_string_actions
-        ):
-            # Add a logging option
-            group.add_argument(
-                "-v",
-                "--verbose",
-                action="count",
-                help="increase the amount of build output",
-            )
+    def _add_info_group(self, existing: AbstractSet[str]):
+        """Add informative options.
 
-        # Add a quiet option to suppress all/most output
-        if (
-            "--quiet" not in self._option_string_actions
-            and "-q" not in self._option_string_actions
-        ):
-            # Add a logging option
-            group.add_argument(
-                "-q",
-                "--quiet",
-                action="store_true",
-                help="do not produce much output",
-            )
-
-    def _add_info_group(self):
-        """Add informative options."""
+        :param existing: option strings which are already defined
+        """
 
         # Create an info group
         group = self.add_argument_group("info arguments")
 
-        if "--version" not in self._option_string_actions:
+        if "--version" not in existing:
             group.add_argument(
                 "--version", action="version", version=f"%(prog)s {self.version}"
             )
@@ -193,9 +220,10 @@ class FabArgumentParser(argparse.ArgumentParser):
         if self._have_logging:
             return
 
-        verbose = getattr(namespace, "verbose", None)
-        debug = getattr(namespace, "debug", None)
-        quiet = getattr(namespace, "quiet", False)
+        options = vars(namespace)
+        verbose = options.get("verbose")
+        debug = options.get("debug")
+        quiet = options.get("quiet", False)
 
         if quiet and (verbose is not None or debug is not None):
             self.error("--quiet conflicts with debug and verbose settings")
@@ -234,17 +262,45 @@ class FabArgumentParser(argparse.ArgumentParser):
         namespace.zero_config = False
 
         if hasattr(namespace, "file") and namespace.file is not None:
-            if not namespace.file.is_file():
+            if not self._is_file(namespace.file):
                 self.error(f"fab file does not exist: '{namespace.file}'")
 
         else:
             # Check for a default fabfile in the current directory or
             # use zero-config mode
-            if self.fabfile.is_file():
+            if self._is_file(self.fabfile):
                 namespace.file = self.fabfile
             else:
                 namespace.zero_config = True
 
+    def _is_file(self, path: Path) -> bool:
+        """Check whether a fab file exists.
+
+        The result for the default fabfile is kept, because it is
+        checked by both phases of a two phase parse.
+
+        :param path: location of the fab file
+        :return: True if the file exists
+        """
+
+        if path != self.fabfile:
+            return path.is_file()
+
+        if self._fabfile_exists is None:
+            self._fabfile_exists = self.fabfile.is_file()
+
+        return self._fabfile_exists
+
+    def _check_workspace(self, namespace: argparse.Namespace) -> None:
+        """Set the default workspace.
+
+        The default workspace is only resolved when the user has not
+        specified one, rather than each time the parser is set up.
+        """
+
+        if getattr(namespace, "workspace", False) is None:
+            namespace.workspace = full_path_type(str(get_fab_workspace()))
+
     def parse_fabfile_only(self, *args, **kwargs):
         """Only attempt to pass the fabfile location.
 
@@ -260,12 +316,16 @@ class FabArgumentParser(argparse.ArgumentParser):
         :return: Namespace containing command line arguments
         """
 
-        # Create a fresh parser and add the file argument
-        file_only = argparse.ArgumentParser(add_help=False, exit_on_error=False)
-        self._add_fabfile_argument(file_only)
+        if self._file_only_parser is None:
+            # Create a separate parser with only the file argument, which
+            # is reused by any later calls
+            self._file_only_parser = argparse.ArgumentParser(
+                add_help=False, exit_on_error=False
+            )
+            self._add_fabfile_argument(self._file_only_parser)
 
         try:
-            nspace, rest = file_only.parse_known_args(*args, **kwargs)
+            nspace, rest = self._file_only_parser.parse_known_args(*args, **kwargs)
         except argparse.ArgumentError as err:
             if err.argument_name == "--file":
                 # Deal with --file problems immediately
@@ -276,12 +336,12 @@ class FabArgumentParser(argparse.ArgumentParser):
 
         return nspace
 
-    @_parser_wrapper
+    @_wrap_ns
     def parse_args(self, *args, **kwargs):
 
         return super().parse_args(*args, **kwargs)
 
-    @_parser_wrapper
+    @_wrap_known
     def parse_known_args(self, *args, **kwargs):
 
         return super().parse_known_args(*args, **kwargs)
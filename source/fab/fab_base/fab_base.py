@@ -11,27 +11,182 @@ only modify very few settings to have a working FAB build script.
 '''
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
-import inspect
+import json
 import logging
 import os
 from pathlib import Path
+import shutil
 import sys
-from typing import List, Optional, Union, Iterable
+from types import FrameType
+from typing import (Any, Callable, Iterator, List, Optional, TYPE_CHECKING,
+                    Union, Iterable)
 
 from fab.build_config import AddFlags, BuildConfig
-from fab.steps.analyse import analyse
-from fab.steps.archive_objects import archive_objects
-from fab.steps.c_pragma_injector import c_pragma_injector
-from fab.steps.compile_c import compile_c
-from fab.steps.compile_fortran import compile_fortran
 from fab.steps.find_source_files import find_source_files, Exclude, Include
-from fab.steps.grab.folder import grab_folder
-from fab.steps.link import link_exe, link_shared_object
-from fab.steps.preprocess import preprocess_c, preprocess_fortran
 from fab.tools.category import Category
+from fab.tools.compiler_wrapper import CompilerWrapper
+from fab.tools.tool import Tool
 from fab.tools.tool_box import ToolBox
 from fab.tools.tool_repository import ToolRepository
+from fab.util import get_fab_workspace
+
+
+logger = logging.getLogger(__name__)
+
+# The supported link targets, the first one is the default.
+VALID_LINK_TARGETS = ("executable", "static-library", "shared-library")
+
+# The name of the file in the Fab workspace, which stores the results of
+# checking the availability of tools.
+TOOL_PROBE_CACHE = ".tool_probe_cache.json"
+
+
+class _LazyStep:
+    '''
+    A stand-in for a Fab step, which imports the module defining the
+    step only when the step is first called. Some steps pull in the
+    Fortran parser, which is expensive to import and not needed if the
+    script only e.g. prints its help message.
+
+    :param module_name: the name of the module defining the step.
+    :param name: the name of the step function.
+    '''
+    def __init__(self, module_name: str, name: str) -> None:
+        self._module_name = module_name
+        self._name = name
+        self._step: Optional[Callable[..., Any]] = None
+
+    def __call__(self, *args, **kwargs) -> Any:
+        if self._step is None:
+            self._step = getattr(import_module(self._module_name),
+                                 self._name)
+        return self._step(*args, **kwargs)
+
+
+if TYPE_CHECKING:
+    from fab.steps.analyse import analyse
+    from fab.steps.archive_objects import archive_objects
+    from fab.steps.c_pragma_injector import c_pragma_injector
+    from fab.steps.compile_c import compile_c
+    from fab.steps.compile_fortran import compile_fortran
+    from fab.steps.grab.folder import grab_folder
+    from fab.steps.link import link_exe, link_shared_object
+    from fab.steps.preprocess import preprocess_c, preprocess_fortran
+else:
+    analyse = _LazyStep("fab.steps.analyse", "analyse")
+    archive_objects = _LazyStep("fab.steps.archive_objects",
+                                "archive_objects")
+    c_pragma_injector = _LazyStep("fab.steps.c_pragma_injector",
+                                  "c_pragma_injector")
+    compile_c = _LazyStep("fab.steps.compile_c", "compile_c")
+    compile_fortran = _LazyStep("fab.steps.compile_fortran",
+                                "compile_fortran")
+    grab_folder = _LazyStep("fab.steps.grab.folder", "grab_folder")
+    link_exe = _LazyStep("fab.steps.link", "link_exe")
+    link_shared_object = _LazyStep("fab.steps.link", "link_shared_object")
+    preprocess_c = _LazyStep("fab.steps.preprocess", "preprocess_c")
+    preprocess_fortran = _LazyStep("fab.steps.preprocess",
+                                   "preprocess_fortran")
+
+
+def _caller_directories() -> Iterator[Path]:
+    '''
+    :returns: the directory of the source file of each frame in the
+        call stack, starting with the caller of this function. This
+        walks the frame objects directly, since ``inspect.stack()``
+        reads the source context of every frame from disk.
+    '''
+    frame: Optional[FrameType] = sys._getframe(1)
+    while frame is not None:
+        yield Path(frame.f_code.co_filename).parent
+        frame = frame.f_back
+
+
+def _prepend_to_sys_path(directory: str) -> None:
+    '''
+    Moves a directory to the front of the Python search path, so that
+    creating several FabBase instances does not keep growing sys.path.
+
+    :param directory: the directory to add.
+    '''
+    if directory in sys.path:
+        sys.path.remove(directory)
+    sys.path.insert(0, directory)
+
+
+def _tool_probe_key(tool: Tool) -> Optional[str]:
+    '''
+    :returns: a key identifying the executable of a tool, and of the
+        compiler it is based on (for linkers), using their location and
+        modification time. None is returned if an executable cannot be
+        found, or if the tool is or uses a compiler wrapper, in which
+        case the availability of the tool should not be cached. Whether
+        a wrapper like mpif90 works depends on the environment (e.g.
+        $OMPI_FC or the loaded modules), not just on its executable.
+    '''
+    parts = []
+    current: Optional[Tool] = tool
+    while current is not None:
+        if isinstance(current, CompilerWrapper):
+            return None
+        exec_path = shutil.which(str(current.exec_path))
+        if not exec_path:
+            return None
+        try:
+            mtime = os.stat(exec_path).st_mtime_ns
+        except OSError:
+            return None
+        parts.append(f"{current.name}:{exec_path}:{mtime}")
+        current = getattr(current, "compiler", None)
+    return "|".join(parts)
+
+
+def _available_tools(tools: List[Tool], cache_fpath: Path) -> List[Tool]:
+    '''
+    Determines which of the given tools are available. Checking a tool
+    runs it as a subprocess, so the checks are done concurrently, and
+    the results are kept in a cache file. A cached result is only used
+    if the tool's executable has not changed since.
+
+    :param tools: the tools to check.
+    :param cache_fpath: the file storing the results of previous checks.
+
+    :returns: the available tools, in the order they were given.
+    '''
+    try:
+        cache = json.loads(cache_fpath.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict):
+        cache = {}
+
+    keys = [_tool_probe_key(tool) for tool in tools]
+
+    def check(tool: Tool, key: Optional[str]) -> bool:
+        if key is not None and isinstance(cache.get(key), bool):
+            return cache[key]
+        return tool.is_available
+
+    with ThreadPoolExecutor(max_workers=min(32, len(tools) or 1)) as pool:
+        is_available = list(pool.map(check, tools, keys))
+
+    # Only keep the results for the current executables, so the cache
+    # does not grow when compilers are updated.
+    new_cache = {key: available for key, available in zip(keys, is_available)
+                 if key is not None}
+    try:
+        cache_fpath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fpath = cache_fpath.with_name(cache_fpath.name + ".tmp")
+        tmp_fpath.write_text(json.dumps(new_cache, indent=2))
+        os.replace(tmp_fpath, cache_fpath)
+    except OSError:
+        # The cache is only an optimisation
+        pass
+
+    return [tool for tool, available in zip(tools, is_available)
+            if available]
 
 
 class FabBase:
@@ -53,9 +208,8 @@ class FabBase:
                  name: str,
                  link_target: str = "executable") -> None:
         self.set_link_target(link_target)
-        self._logger = logging.getLogger(__name__)
-        self._site = None
-        self._platform = None
+        self._site: Optional[str] = None
+        self._platform: Optional[str] = None
         # Save the name to use as library name (if required)
         self._name = name
         self._target = ""
@@ -109,6 +263,7 @@ class FabBase:
                                    openmp=self.args.openmp,
                                    profile=self.args.profile,
                                    fab_workspace=fab_workspace,
+                                   cache_steps=self.args.cache_steps,
                                    )
 
         if self._site_config:
@@ -124,10 +279,9 @@ class FabBase:
         :raises ValueError: if the link_target is invalid
         '''
         link_target = link_target.lower()
-        valid_targets = ["executable", "static-library", "shared-library"]
-        if link_target not in valid_targets:
+        if link_target not in VALID_LINK_TARGETS:
             raise ValueError(f"Invalid parameter '{link_target}', must be "
-                             f"one of '{', '.join(valid_targets)}'.")
+                             f"one of '{', '.join(VALID_LINK_TARGETS)}'.")
         self._link_target = link_target
 
     def define_project_name(self, name: str) -> str:
@@ -174,7 +328,7 @@ class FabBase:
         '''
         :returns: the logging instance to use.
         '''
-        return self._logger
+        return logger
 
     @property
     def platform(self) -> Optional[str]:
@@ -259,14 +413,15 @@ class FabBase:
         is located. An application can overwrite this method to change this
         behaviour and point at site-specific directories elsewhere.
         '''
-        my_base_dir = Path(__file__).parent
-        for caller in inspect.stack():
-            dir_caller = Path(caller[1]).parent
-            if not my_base_dir.samefile(dir_caller):
+        # Compare resolved path names, which avoids two stat calls
+        # per frame for `samefile`:
+        my_base_dir = os.path.realpath(os.path.dirname(__file__))
+        for dir_caller in _caller_directories():
+            if os.path.realpath(dir_caller) != my_base_dir:
                 # This is required in case that the script is not
                 # called from the script directory, but site_specific
                 # is in the directory of the script.
-                sys.path.insert(0, str(dir_caller))
+                _prepend_to_sys_path(str(dir_caller))
                 break
         else:
             # All callers are in this directory? Add a warning, and
@@ -281,7 +436,7 @@ class FabBase:
         # each config can import from 'default' (instead of having to
         # use 'site_specific.default', which would hard-code the name
         # `site_specific` in more scripts).
-        sys.path.insert(0, str(dir_caller / "site_specific"))
+        _prepend_to_sys_path(str(dir_caller / "site_specific"))
 
     def define_site_platform_target(self) -> None:
         '''
@@ -332,8 +487,8 @@ class FabBase:
         except ModuleNotFoundError as err:
             # We log a warning, but proceed, since there is no need to
             # have a site-specific file.
-            self._logger.warning(f"Cannot find site-specific module "
-                                 f"'{config_name}': {err}.")
+            self.logger.warning(f"Cannot find site-specific module "
+                                f"'{config_name}': {err}.")
             self._site_config = None
             return
         self.logger.info(f"fab_base: Imported '{config_module.__file__}'.")
@@ -430,6 +585,11 @@ class FabBase:
                             default=None,
                             help="Fab workspace, in which the build "
                                  "directory will be created.")
+        parser.add_argument("--cache-steps", default=False,
+                            action="store_true",
+                            help="Skip the preprocessing and analysis steps "
+                                 "if their inputs have not changed since a "
+                                 "previous build.")
         if self._site_config:
             valid_profiles = self._site_config.get_valid_profiles()
             parser.add_argument(
@@ -450,6 +610,7 @@ class FabBase:
         :param argparse.ArgumentParser parser: the argument parser.
         '''
         # pylint: disable=too-many-branches
+        env = os.environ
         self._args = parser.parse_args(sys.argv[1:])
         if self.args.host.lower() not in ["", "cpu", "gpu"]:
             raise RuntimeError(f"Invalid host directive "
@@ -458,19 +619,17 @@ class FabBase:
 
         tr = ToolRepository()
         if self.args.available_compilers:
-            all_available = []
             # We don't print the values immediately, since `is_available` runs
             # tests with debugging enabled, which adds a lot of debug output.
             # Instead write the combined list at the end and then exit.
-            for compiler in tr[Category.C_COMPILER]:
-                if compiler.is_available:
-                    all_available.append(compiler)
-            for compiler in tr[Category.FORTRAN_COMPILER]:
-                if compiler.is_available:
-                    all_available.append(compiler)
-            for linker in tr[Category.LINKER]:
-                if linker.is_available:
-                    all_available.append(linker)
+            tools = (tr[Category.C_COMPILER] + tr[Category.FORTRAN_COMPILER] +
+                     tr[Category.LINKER])
+            if self.args.fab_workspace:
+                fab_workspace = Path(self.args.fab_workspace)
+            else:
+                fab_workspace = get_fab_workspace()
+            all_available = _available_tools(
+                tools, fab_workspace / TOOL_PROBE_CACHE)
             print("\n----- Available compiler and linkers -----")
             for tool in all_available:
                 print(tool)
@@ -503,11 +662,11 @@ class FabBase:
             # If no suite is specified, if required set the defaults
             # for compilers based on the environment variables.
             if self.args.fc == "$FC":
-                self.args.fc = os.environ.get("FC")
+                self.args.fc = env.get("FC")
             if self.args.cc == "$CC":
-                self.args.cc = os.environ.get("CC")
+                self.args.cc = env.get("CC")
             if self.args.ld == "$LD":
-                self.args.ld = os.environ.get("LD")
+                self.args.ld = env.get("LD")
 
         # If no suite was specified, and a special tool was requested,
         # add it to the tool box:
@@ -524,28 +683,31 @@ class FabBase:
         # If the user specified compiler flags in the
         # environment variables CFLAGS, FFLAGS, LDFLAGS, add them to the
         # list of flags to be used by the corresponding tools.
-        self._fortran_compiler_flags_commandline = \
-            os.environ.get("FFLAGS", "").split()
-        self._c_compiler_flags_commandline = \
-            os.environ.get("CFLAGS", "").split()
-        self._linker_flags_commandline = \
-            os.environ.get("LDFLAGS", "").split()
+        self._fortran_compiler_flags_commandline = []
+        self._c_compiler_flags_commandline = []
+        self._linker_flags_commandline = []
+        for env_flags, flags in [
+                (env.get("FFLAGS"), self._fortran_compiler_flags_commandline),
+                (env.get("CFLAGS"), self._c_compiler_flags_commandline),
+                (env.get("LDFLAGS"), self._linker_flags_commandline)]:
+            if env_flags:
+                flags.extend(env_flags.split())
 
         if self.args.fflags:
             # If the user specified Fortran compiler flags, add them
             # to the list of flags to be used by the Fortran compiler.
-            self._fortran_compiler_flags_commandline += \
-                self.args.fflags.split()
+            self._fortran_compiler_flags_commandline.extend(
+                self.args.fflags.split())
         if self.args.cflags:
             # If the user specified C compiler flags, add them
             # to the list of flags to be used by the C compiler.
-            self._c_compiler_flags_commandline += \
-                self.args.cflags.split()
+            self._c_compiler_flags_commandline.extend(
+                self.args.cflags.split())
         if self.args.ldflags:
             # If the user specified linker flags, add them
             # to the list of flags to be used by the linker.
-            self._linker_flags_commandline += \
-                self.args.ldflags.split()
+            self._linker_flags_commandline.extend(
+                self.args.ldflags.split())
 
     def define_preprocessor_flags_step(self) -> None:
         '''
@@ -764,7 +926,6 @@ class FabBase:
 # ==========================================================================
 if __name__ == "__main__":
     # This tests the FabBase class using the command line.
-    logger = logging.getLogger(__name__)
     logger.setLevel(logging.DEBUG)
     fab_base = FabBase(name="command-line-test")
     fab_base.build()
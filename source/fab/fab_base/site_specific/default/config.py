@@ -6,6 +6,7 @@ This module contains the default Baf configuration class.
 '''
 
 import argparse
+from itertools import chain
 from typing import cast, Dict, List
 
 from fab.api import AddFlags, BuildConfig, Category, Compiler, ToolRepository
@@ -78,9 +79,10 @@ class Config:
         # to be initialised - so we just initialise all of them (including
         # the linker):
         tr = ToolRepository()
-        for compiler in (tr[Category.C_COMPILER] +
-                         tr[Category.FORTRAN_COMPILER] +
-                         tr[Category.LINKER]):
+        profiles = self.get_valid_profiles()
+        for compiler in chain(tr[Category.C_COMPILER],
+                              tr[Category.FORTRAN_COMPILER],
+                              tr[Category.LINKER]):
             # Define a base profile, which contains the common
             # compilation flags. This 'base' is not accessible to
             # the user, so it's not part of the profile list. Also,
@@ -91,7 +93,7 @@ class Config:
             # so e.g. mpif90-ifort works, but ifort cannot be found.
             # We still need to be able to set and query flags for ifort.
             compiler.define_profile("base", inherit_from="")
-            for profile in self.get_valid_profiles():
+            for profile in profiles:
                 compiler.define_profile(profile, inherit_from="base")
 
         self.setup_intel_classic(build_config)
@@ -32,6 +32,8 @@ def setup_cray(build_config: BuildConfig,
     if not ftn.is_available:
         return {}
 
+    version = ftn.get_version()
+
     # The base flags
     # ==============
     flags = ["-g", "-G0", "-m", "0",
@@ -68,7 +70,7 @@ def setup_cray(build_config: BuildConfig,
                                    # pointer, string checking
                    "-O0"],         # No optimisation
                   "full-debug")
-    if ftn.get_version() >= (15, 0):
+    if version >= (15, 0):
         ftn.add_flags(["-G0"], "full-debug")
     else:
         ftn.add_flags(["-Gfast"], "full-debug")
@@ -76,7 +78,7 @@ def setup_cray(build_config: BuildConfig,
     # Fast debug
     # ==========
     ftn.add_flags(["-O2"], "fast-debug")
-    if ftn.get_version() >= (15, 0):
+    if version >= (15, 0):
         ftn.add_flags(["-G2"], "fast-debug")
     else:
         ftn.add_flags(["-Gfast"], "fast-debug")
@@ -8,9 +8,10 @@
 Logging tools for the fab framework.
 """
 
+import os
 import sys
 import logging
-import inspect
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -32,33 +33,53 @@ def make_logger(feature: str, offset: int = 1):
     :return: a logging.Logger instance.
     """
 
-    # Get information about the caller using the inspect module
-    finfo = inspect.stack()[offset]
-    frame = finfo.frame
+    # Get the frame of the caller.  Unlike inspect.stack(), this does
+    # not build the context of every frame in the call stack
+    frame = sys._getframe(offset)
     code = frame.f_code
-    module = inspect.getmodule(frame)
-    if module is not None:
-        parts = module.__name__.split(".")
-    else:
-        parts = ["root"]
+    module = sys.modules.get(frame.f_globals.get("__name__", ""))
+    module_name = module.__name__ if module is not None else None
 
     if (
-        finfo.function == "__init__"
+        code.co_name == "__init__"
         and len(code.co_varnames)
         and code.co_varnames[0] == "self"
     ):
         # Use the class name
-        parts.append(frame.f_locals["self"].__class__.__name__)
-    elif finfo.function != "<module>":
+        name: Optional[str] = frame.f_locals["self"].__class__.__name__
+    elif code.co_name != "<module>":
         # Use the function name if not called directly in a module
-        parts.append(finfo.function)
+        name = code.co_name
+    else:
+        name = None
+
+    return logging.getLogger(_logger_name(module_name, name, feature))
+
+
+@lru_cache(maxsize=1024)
+def _logger_name(module_name: Optional[str], name: Optional[str], feature: str) -> str:
+    """Assemble the name of a hierarchical logger.
+
+    The result is cached, since loggers are typically created many
+    times from the same place.
+
+    :param module_name: the name of the calling module, or None if it
+        is not known.
+    :param name: the name of the calling function or class, or None if
+        the logger is created in a module.
+    :param feature: the name of the logging feature.
+    :return: the name of the logger.
+    """
+
+    parts = module_name.split(".") if module_name is not None else ["root"]
+    if name is not None:
+        parts.append(name)
 
     # Clean up the name and insert the feature name
     parts = [i.replace("__", "") for i in parts]
     parts.insert(1, feature)
 
-    # Finally assemble the logger
-    return logging.getLogger(".".join(parts))
+    return ".".join(parts)
 
 
 def make_loggers():
@@ -94,30 +115,40 @@ class FabLogFilter(logging.Filter):
         self.system_level = system_level
         self.quiet = quiet
 
-    def filter(self, record):
-        """Decide whether to filter a specific log message."""
+        # Convert the verbosity levels into logging level thresholds
+        # once, so that filtering a record is a single comparison
+        self._build_threshold = self._threshold(build_level, quiet)
+        self._system_threshold = self._threshold(system_level, quiet)
 
-        if ".build" in record.name:
-            # A build hierarchy message
-            level = self.build_level
-        else:
-            # Assume all other messages are in the system category
-            level = self.system_level
+    @staticmethod
+    def _threshold(level: Optional[int], quiet: bool) -> int:
+        """Determine the lowest logging level to let through.
 
-        if self.quiet and record.levelno < logging.ERROR:
-            # Filter out everything except errors in quiet mode
-            return False
+        :param level: the verbosity level.
+        :param quiet: whether only errors are logged.
+        :return: the lowest logging level which is not filtered out.
+        """
 
-        if (level is None or level <= 0) and record.levelno < logging.WARNING:
+        if quiet:
+            # Filter out everything except errors in quiet mode
+            return logging.ERROR
+        if level is None or level <= 0:
             # Filter out anything below warning
-            return False
-
-        if level == 1 and record.levelno < logging.INFO:
+            return logging.WARNING
+        if level == 1:
             # Filter out anything below info
-            return False
+            return logging.INFO
+        return logging.NOTSET
+
+    def filter(self, record):
+        """Decide whether to filter a specific log message."""
+
+        if ".build" in record.name:
+            # A build hierarchy message
+            return record.levelno >= self._build_threshold
 
-        # Log all messages that have made it this far
-        return True
+        # Assume all other messages are in the system category
+        return record.levelno >= self._system_threshold
 
 
 def setup_logging(
@@ -151,6 +182,12 @@ def setup_logging(
     fab_logger = logging.getLogger("fab")
     fab_logger.setLevel(logging.DEBUG)
 
+    # Remove the stream handler of any earlier call, so that messages
+    # are not written more than once
+    for handler in list(fab_logger.handlers):
+        if any(isinstance(i, FabLogFilter) for i in handler.filters):
+            fab_logger.removeHandler(handler)
+
     # Output format includes the module if running in debug mode
     if system_level is None or system_level == 0:
         formatter = logging.Formatter("%(asctime)s %(message)s")
@@ -176,6 +213,15 @@ def setup_file_logging(logfile: Path, name="root", create=True):
 
     logfile = Path(logfile)
 
+    logger = logging.getLogger(name)
+    for handler in logger.handlers:
+        if (
+            isinstance(handler, logging.FileHandler)
+            and handler.baseFilename == os.path.abspath(logfile)
+        ):
+            # Already logging to this file
+            return
+
     if create:
         # Create the log directory
         logfile.parent.mkdir(parents=True, exist_ok=True)
@@ -184,4 +230,4 @@ def setup_file_logging(logfile: Path, name="root", create=True):
     logfh = logging.FileHandler(logfile)
     logfh.setLevel(logging.DEBUG)
     logfh.setFormatter(logfm)
-    logging.getLogger(name).addHandler(logfh)
+    logger.addHandler(logfh)
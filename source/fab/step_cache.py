@@ -0,0 +1,298 @@
+##############################################################################
+# (c) Crown copyright Met Office. All rights reserved.
+# For further details please refer to the file COPYRIGHT
+# which you should have received as part of this distribution
+##############################################################################
+"""
+A step-level build cache, which allows whole steps to be skipped when
+their inputs have not changed since a previous run.
+
+The fingerprint of a step is computed from the step name, its arguments,
+the tools it uses and the content of the artefact store before
+the step runs. Every path in the artefact store contributes its
+modification time and size, so editing a source file changes the
+fingerprint of every step that depends on it.
+
+After a cacheable step has run, a snapshot of the artefact store is
+pickled into the cache folder. The manifest maps each input fingerprint
+to the fingerprint of the resulting artefact store, and is written when
+the build config exits. On a later run with the same input fingerprint,
+the snapshot is restored instead of running the step, provided that the
+files it refers to have not changed in the meantime.
+
+"""
+
+import hashlib
+import json
+import logging
+import pickle
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from types import CodeType, MethodType
+from typing import Any, Dict, Iterable, Optional
+
+from fab.tools.category import Category
+from fab.tools.tool import Tool
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# The number of snapshots kept in the cache, older ones are removed
+MAX_ENTRIES = 64
+
+
+class _Uncacheable(Exception):
+    """Raised when a step argument cannot be fingerprinted."""
+
+
+def _update_digest(hasher, value: Any, profile: Optional[str] = None):
+    """
+    Add a canonical representation of a value to a hash.
+
+    Sets and dicts are sorted, so the result does not depend on the
+    iteration order. Paths are hashed together with their modification
+    time and size. Tools are hashed with their flags for the given
+    profile, functions with their code, defaults and closure, and
+    partials and bound methods with the state they are bound to.
+    Other objects are only hashed by their attributes if their class
+    is part of Fab, since the state of arbitrary objects might not
+    be held in their attributes.
+
+    :param profile: the compiler profile used to get the flags of tools.
+
+    :raises _Uncacheable: if the value has no stable representation.
+    """
+    # The type name keeps e.g. a list and a tuple of the same values apart
+    hasher.update(type(value).__qualname__.encode())
+
+    if isinstance(value, Path):
+        hasher.update(str(value).encode())
+        try:
+            stat = value.stat()
+            hasher.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode())
+        except OSError:
+            hasher.update(b'<missing>')
+
+    elif value is None or value is Ellipsis or isinstance(
+            value, (str, bytes, int, float, complex, bool, Enum)):
+        hasher.update(repr(value).encode())
+
+    elif isinstance(value, dict):
+        items = sorted((_digest(key, profile), _digest(val, profile))
+                       for key, val in value.items())
+        hasher.update(repr(items).encode())
+
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(repr(sorted(_digest(item, profile)
+                                  for item in value)).encode())
+
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_digest(hasher, item, profile)
+
+    elif isinstance(value, Tool):
+        hasher.update(f'{value.name}:{value.exec_path}'.encode())
+        try:
+            flags = value.get_flags(profile)
+        except KeyError:
+            # The profile is not defined for this tool
+            flags = None
+        _update_digest(hasher, flags)
+
+    elif isinstance(value, CodeType):
+        hasher.update(f'{value.co_name}:{value.co_names}'.encode())
+        hasher.update(value.co_code)
+        # Nested functions are code objects in the constants
+        _update_digest(hasher, value.co_consts)
+
+    elif hasattr(value, 'to_dict'):
+        # Analysis results
+        hasher.update(json.dumps(value.to_dict(), sort_keys=True).encode())
+
+    elif isinstance(value, partial):
+        _update_digest(hasher, value.func, profile)
+        _update_digest(hasher, value.args, profile)
+        _update_digest(hasher, dict(value.keywords), profile)
+
+    elif isinstance(value, MethodType):
+        _update_digest(hasher, value.__self__, profile)
+        _update_digest(hasher, value.__func__, profile)
+
+    elif callable(value) and hasattr(value, '__qualname__'):
+        # Functions, e.g. a PSyclone transformation script getter
+        hasher.update(f'{value.__module__}.{value.__qualname__}'.encode())
+        code = getattr(value, '__code__', None)
+        if code is not None:
+            # Python functions: changes to the body, the default arguments
+            # or the variables captured in a closure change the hash
+            _update_digest(hasher, code)
+            _update_digest(hasher, getattr(value, '__defaults__', None),
+                           profile)
+            for cell in getattr(value, '__closure__', None) or ():
+                try:
+                    _update_digest(hasher, cell.cell_contents, profile)
+                except ValueError:
+                    # The variable has not been assigned yet
+                    hasher.update(b'<empty>')
+
+    elif (hasattr(value, '__dict__') and
+          type(value).__module__.split('.')[0] == 'fab'):
+        # Fab's own classes, e.g. artefact getters and AddFlags
+        _update_digest(hasher, vars(value), profile)
+
+    else:
+        raise _Uncacheable(f"cannot fingerprint {type(value).__name__}")
+
+
+def _digest(value: Any, profile: Optional[str] = None) -> str:
+    """
+    :returns: the hex digest of the canonical representation of a value.
+    """
+    hasher = hashlib.sha256()
+    _update_digest(hasher, value, profile)
+    return hasher.hexdigest()
+
+
+class StepCache:
+    """
+    Stores artefact store snapshots for cacheable steps, indexed by the
+    fingerprint of the step's inputs.
+
+    """
+    def __init__(self, folder: Path, max_entries: int = MAX_ENTRIES):
+        """
+        :param folder:
+            The folder holding the manifest and the snapshots.
+        :param max_entries:
+            The number of snapshots to keep. When more are recorded, the
+            least recently used ones are removed.
+
+        """
+        self.folder = folder
+        self.max_entries = max_entries
+        self._manifest: Dict[str, Dict[str, str]] = {}
+
+        manifest_fpath = folder / MANIFEST_FILENAME
+        if manifest_fpath.is_file():
+            try:
+                self._manifest = json.loads(manifest_fpath.read_text())
+            except ValueError:
+                logger.warning(f"ignoring invalid step cache manifest "
+                               f"'{manifest_fpath}'")
+
+    def fingerprint(self, name: str, config, args, kwargs,
+                    tools: Iterable[Category] = ()) -> Optional[str]:
+        """
+        Compute the input fingerprint of a step.
+
+        :param name:
+            The name of the step.
+        :param config:
+            The :class:`fab.build_config.BuildConfig` the step runs in.
+        :param args:
+            The positional arguments of the step, without the config.
+        :param kwargs:
+            The keyword arguments of the step, without the config.
+        :param tools:
+            The categories of the tools the step uses. Each tool is
+            resolved from the tool box as the step itself does, so the
+            tool box ends up in the same state whether or not the step
+            is restored from the cache.
+
+        :returns: the fingerprint, or None if the step arguments cannot be
+            fingerprinted (in which case the step is not cached).
+
+        """
+        resolved = [config.tool_box.get_tool(category) for category in tools]
+        try:
+            return _digest([name, args, kwargs,
+                            config.profile, config.mpi, config.openmp,
+                            config.two_stage, resolved,
+                            dict(config.artefact_store)],
+                           config.profile)
+        except (_Uncacheable, RecursionError) as err:
+            logger.debug(f"not caching step {name}: {err}")
+            return None
+
+    def restore(self, fingerprint: str, artefact_store) -> bool:
+        """
+        Replace the content of the artefact store with the snapshot
+        recorded for the given fingerprint.
+
+        Nothing is restored if there is no snapshot, or if any file in the
+        snapshot has changed since it was recorded.
+
+        :param fingerprint:
+            The input fingerprint of the step.
+        :param artefact_store:
+            The artefact store to update.
+
+        :returns: whether the snapshot was restored.
+
+        """
+        entry = self._manifest.get(fingerprint)
+        if entry is None:
+            return False
+
+        try:
+            with open(self.folder / f'{fingerprint}.pickle', 'rb') as infile:
+                snapshot = pickle.load(infile)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+
+        # Make sure the outputs are still the files the step created
+        try:
+            if _digest(snapshot) != entry['output']:
+                return False
+        except (_Uncacheable, RecursionError):
+            return False
+
+        # Move the entry to the end, so it is removed last
+        self._manifest[fingerprint] = self._manifest.pop(fingerprint)
+
+        artefact_store.clear()
+        artefact_store.update(snapshot)
+        return True
+
+    def record(self, name: str, fingerprint: str, artefact_store):
+        """
+        Store a snapshot of the artefact store after a step has run.
+
+        :param name:
+            The name of the step, for human readability of the manifest.
+        :param fingerprint:
+            The input fingerprint of the step.
+        :param artefact_store:
+            The artefact store after the step has run.
+
+        """
+        snapshot = dict(artefact_store)
+        try:
+            output = _digest(snapshot)
+        except (_Uncacheable, RecursionError) as err:
+            logger.debug(f"not caching step {name}: {err}")
+            return
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.folder / f'{fingerprint}.pickle', 'wb') as outfile:
+            pickle.dump(snapshot, outfile)
+        self._manifest.pop(fingerprint, None)
+        self._manifest[fingerprint] = {'step': name, 'output': output}
+
+        # Remove the least recently used snapshots. The manifest keeps
+        # the entries in the order they were last recorded or restored.
+        while len(self._manifest) > self.max_entries:
+            oldest = next(iter(self._manifest))
+            del self._manifest[oldest]
+            (self.folder / f'{oldest}.pickle').unlink(missing_ok=True)
+
+    def save(self):
+        """
+        Write the manifest.
+
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.folder / MANIFEST_FILENAME, 'wt') as outfile:
+            json.dump(self._manifest, outfile, indent=4)
@@ -6,13 +6,18 @@
 """
 Predefined build steps with sensible defaults.
 """
+import logging
 import multiprocessing
 from typing import Iterable, Optional, Union
 
 from fab.metrics import send_metric
+from fab.step_cache import StepCache
+from fab.tools.category import Category
 from fab.util import by_type, TimerLogger
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
 
 def step(func):
     """Function decorator for steps."""
@@ -30,6 +35,63 @@ def step(func):
     return wrapper
 
 
+def cached_step(func=None, *, tools: Iterable[Category] = ()):
+    """
+    Function decorator for steps which can be skipped when their inputs
+    are unchanged.
+
+    If the config has a :class:`~fab.step_cache.StepCache`, the step is
+    only run if there is no cached result for the current step arguments,
+    tools and artefact store. Otherwise the artefact store is restored
+    from the cache. A cached step must only read its inputs from its
+    arguments, the tools it declares and the artefact store.
+
+    Can be used as ``@cached_step``, or as
+    ``@cached_step(tools=[Category.FORTRAN_PREPROCESSOR])`` for a step
+    which gets tools from the tool box.
+
+    :param tools:
+        The categories of the tools the step gets from the tool box.
+
+    """
+    if func is None:
+        return lambda func: cached_step(func, tools=tools)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+
+        name = func.__name__
+
+        # The config is always the first argument of a step
+        if args:
+            config, step_args = args[0], args[1:]
+        else:
+            config, step_args = kwargs.get('config'), ()
+        step_kwargs = {key: value for key, value in kwargs.items()
+                       if key != 'config'}
+
+        step_cache = getattr(config, 'step_cache', None)
+        fingerprint = None
+        if isinstance(step_cache, StepCache):
+            fingerprint = step_cache.fingerprint(name, config, step_args,
+                                                 step_kwargs, tools)
+
+        with TimerLogger(name) as step:
+            if fingerprint and step_cache.restore(fingerprint,
+                                                  config.artefact_store):
+                logger.info(f'{name}: inputs unchanged, using cached '
+                            f'artefacts')
+            else:
+                func(*args, **kwargs)
+                if fingerprint:
+                    step_cache.record(name, fingerprint,
+                                      config.artefact_store)
+
+        send_metric('steps', name, step.taken)
+
+    return wrapper
+
+
 def run_mp(config, items, func, no_multiprocessing: bool = False):
     """
     Called from Step.run() to process multiple items in parallel.
@@ -11,7 +11,7 @@ import logging
 import os
 from datetime import timedelta, datetime
 from pathlib import Path
-from typing import Dict, Optional, Iterable, Set
+from typing import AbstractSet, Dict, Optional, Iterable, Set
 
 from fab.artefacts import ArtefactSet
 from fab.steps import run_mp, step
@@ -89,6 +89,7 @@ def cleanup_prebuilds(
 def by_age(older_than: Optional[timedelta],
            prebuilds_ts: Dict[Path, datetime], current_files: Iterable[Path]) -> Set[Path]:
     to_delete = set()
+    current_files = _as_set(current_files)
 
     if older_than:
         most_recent_ts = max(prebuilds_ts.values())
@@ -108,6 +109,7 @@ def by_age(older_than: Optional[timedelta],
 
 def by_version_age(n_versions: int, prebuilds_ts: Dict[Path, datetime], current_files: Iterable[Path]) -> Set[Path]:
     to_delete = set()
+    current_files = _as_set(current_files)
 
     if n_versions:
         # group prebuild files by originating artefact, <stem>.*.<suffix>
@@ -129,6 +131,7 @@ def by_version_age(n_versions: int, prebuilds_ts: Dict[Path, datetime], current_
 
 def remove_all_unused(found_files: Iterable[Path], current_files: Iterable[Path]):
     num_removed = 0
+    current_files = _as_set(current_files)
 
     for f in found_files:
         if f not in current_files:
@@ -139,6 +142,16 @@ def remove_all_unused(found_files: Iterable[Path], current_files: Iterable[Path]
     return num_removed
 
 
+def _as_set(files: Iterable[Path]) -> AbstractSet[Path]:
+    """
+    Return the given files as a set, so that membership tests are O(1).
+
+    """
+    if isinstance(files, AbstractSet):
+        return files
+    return set(files)
+
+
 def get_access_time(fpath: Path) -> datetime:
     """
     Return the access time of the given file.
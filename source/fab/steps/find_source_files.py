@@ -8,6 +8,7 @@ Gather files from a source folder.
 
 """
 import logging
+from pathlib import Path
 from typing import Optional, Iterable
 
 from fab.artefacts import ArtefactSet
@@ -31,9 +32,12 @@ class _PathFilter(object):
         """
         self.filter_strings: Iterable[str] = filter_strings
         self.include = include
+        # Filters can be given as paths, so convert them only once
+        self._match_strings = [str(i) for i in filter_strings]
 
     def check(self, path):
-        if any(str(i) in str(path) for i in self.filter_strings):
+        path = str(path)
+        if any(i in path for i in self._match_strings):
             return self.include
         return None
 
@@ -118,25 +122,44 @@ def find_source_files(config, source_root=None,
         Human friendly name for logger output, with sensible default.
 
     """
-    path_filters = path_filters or []
+    path_filters = list(path_filters or [])
 
     # Recursively get all files in the given folder, with filtering.
 
     source_root = source_root or config.source_root
 
+    # A file path contains the path of its folder, so an Exclude filter
+    # which matches a folder also matches every file in it. If no Include
+    # filter follows that Exclude, none of the files can be wanted, and the
+    # folder does not need to be traversed at all.
+    last_include = max((index for index, path_filter in enumerate(path_filters)
+                        if path_filter.include), default=-1)
+    final_excludes = path_filters[last_include + 1:]
+
+    def wanted_folder(folder: Path) -> bool:
+        # Files in the folder all start with the folder path and a separator
+        folder_prefix = f'{folder}/'
+        return not any(path_filter.check(folder_prefix) is False
+                       for path_filter in final_excludes)
+
     # file filtering
     filtered_fpaths = set()
     # todo: we shouldn't need to ignore the prebuild folder here, it's not
     # underneath the source root.
     for fpath in file_walk(source_root,
-                           ignore_folders=[config.prebuild_folder]):
+                           ignore_folders=[config.prebuild_folder],
+                           folder_filter=wanted_folder):
 
+        # The last filter which has anything to say about this file
+        # decides, so search the filters backwards and stop at the first
+        # match.
         wanted = True
-        for path_filter in path_filters:
-            # did this filter have anything to say about this file?
-            res = path_filter.check(fpath)
+        fpath_str = str(fpath)
+        for path_filter in reversed(path_filters):
+            res = path_filter.check(fpath_str)
             if res is not None:
                 wanted = res
+                break
 
         if wanted:
             filtered_fpaths.add(fpath)
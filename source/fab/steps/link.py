@@ -37,7 +37,8 @@ class DefaultLinkerSource(ArtefactsGetter):
 def link_exe(config,
              libs: Optional[List[str]] = None,
              flags: Optional[List[str]] = None,
-             source: Optional[ArtefactsGetter] = None) -> None:
+             source: Optional[ArtefactsGetter] = None,
+             use_response_file: bool = False) -> None:
     """
     Link object files into an executable for every build target.
 
@@ -60,6 +61,11 @@ def link_exe(config,
     :param source:
         An optional :class:`~fab.artefacts.ArtefactsGetter`. It defaults to the
         output from compiler steps, which typically is the expected behaviour.
+    :param use_response_file:
+        Pass the object files to the linker in a response file
+        (`@<build_output>/<target>.rsp`) instead of on the command line. This
+        avoids exceeding the maximum command line length when linking a
+        large number of object files.
 
     """
     source_getter = source or DefaultLinkerSource()
@@ -94,8 +100,11 @@ def link_exe(config,
 
     for root, objects in target_objects.items():
         exe_path = config.project_workspace / f'{root}'
+        response_file = None
+        if use_response_file:
+            response_file = config.build_output / f'{root}.rsp'
         linker.link(objects, exe_path, config=config, libs=libs,
-                    add_flags=flags)
+                    add_flags=flags, response_file=response_file)
         config.artefact_store.add(ArtefactSet.EXECUTABLES, exe_path)
 
 
@@ -17,7 +17,7 @@ from fab.artefacts import (ArtefactSet, ArtefactsGetter, SuffixFilter,
                            CollectionGetter)
 from fab.build_config import BuildConfig, FlagsConfig
 from fab.metrics import send_metric
-from fab.steps import check_for_errors, run_mp, step
+from fab.steps import cached_step, check_for_errors, run_mp
 from fab.tools.category import Category
 from fab.tools.preprocessor import Cpp, CppFortran, Preprocessor
 from fab.util import (log_or_dot_finish, input_to_output_fpath, log_or_dot,
@@ -128,7 +128,7 @@ def process_artefact(arg: Tuple[Path, MpCommonArgs]):
 
 
 # todo: rename preprocess_fortran
-@step
+@cached_step(tools=[Category.FORTRAN_PREPROCESSOR])
 def preprocess_fortran(config: BuildConfig, source: Optional[ArtefactsGetter] = None, **kwargs):
     """
     Wrapper to pre_processor for Fortran files.
@@ -209,7 +209,7 @@ class DefaultCPreprocessorSource(ArtefactsGetter):
 
 
 # todo: rename preprocess_c
-@step
+@cached_step(tools=[Category.C_PREPROCESSOR])
 def preprocess_c(config: BuildConfig,
                  source: Optional[ArtefactsGetter] = None, **kwargs):
     """
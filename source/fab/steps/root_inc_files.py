@@ -67,6 +67,6 @@ def root_inc_files(config: BuildConfig,
         if fpath.name in inc_copied:
             raise FileExistsError(f"name clash for include file: {fpath}")
 
-        logger.debug(f"copying include file {fpath}")
+        logger.debug("copying include file %s", fpath)
         shutil.copy(fpath, build_output)
         inc_copied.add(fpath.name)
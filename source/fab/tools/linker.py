@@ -10,6 +10,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+import re
 from typing import Dict, List, Optional, Union
 import warnings
 
@@ -20,6 +21,18 @@ from fab.tools.flags import ProfileFlags
 from fab.tools.tool import CompilerSuiteTool
 
 
+def _quote_response_arg(arg: str) -> str:
+    '''Escapes an argument for a compiler response file, in which
+    whitespace separates arguments and a backslash escapes the next
+    character.
+
+    :param arg: the argument to escape.
+
+    :returns: the escaped argument.
+    '''
+    return re.sub(r"([\s'\"\\])", r"\\\1", arg)
+
+
 class Linker(CompilerSuiteTool):
     '''This is the base class for any Linker. It takes an existing compiler
     instance as parameter, and optional another linker. The latter is used
@@ -222,7 +235,8 @@ class Linker(CompilerSuiteTool):
     def link(self, input_files: List[Path], output_file: Path,
              config: "BuildConfig",
              libs: Optional[List[str]] = None,
-             add_flags: Optional[List[str]] = None) -> str:
+             add_flags: Optional[List[str]] = None,
+             response_file: Optional[Path] = None) -> str:
         '''Executes the linker with the specified input files,
         creating `output_file`.
 
@@ -231,6 +245,10 @@ class Linker(CompilerSuiteTool):
         :param config: The BuildConfig, from which compiler profile and OpenMP
             status are taken.
         :param libs: additional libraries to link with.
+        :param add_flags: additional flags to pass to the linker.
+        :param response_file: if specified, the input files are written to
+            this file, which is passed to the linker as `@response_file`.
+            This keeps the command line short when linking many files.
 
         :returns: the stdout of the link command
         '''
@@ -243,7 +261,15 @@ class Linker(CompilerSuiteTool):
             params.append(self._compiler.openmp_flag)
 
         # TODO: why are the .o files sorted? That shouldn't matter
-        params.extend(sorted(map(str, input_files)))
+        input_names = sorted(map(str, input_files))
+        if response_file:
+            response_file.parent.mkdir(parents=True, exist_ok=True)
+            response_file.write_text(
+                "".join(f"{_quote_response_arg(name)}\n"
+                        for name in input_names))
+            params.append(f"@{response_file}")
+        else:
+            params.extend(input_names)
         params.extend(self.get_pre_link_flags(config))
 
         for lib in (libs or []):
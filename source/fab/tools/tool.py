@@ -195,7 +195,9 @@ class Tool:
         if self._is_available is False:
             raise RuntimeError(f"Tool '{self.name}' is not available to run "
                                f"'{command}'.")
-        self._logger.debug(f'run_command: {" ".join(command)}')
+        # Only join long command lines if they are going to be logged
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f'run_command: {" ".join(command)}')
         try:
             res = subprocess.run(command, capture_output=capture_output,
                                  env=env, cwd=cwd, check=False)
@@ -205,10 +207,11 @@ class Tool:
         if res.returncode != 0:
             msg = (f'Command failed with return code {res.returncode}:\n'
                    f'{command}')
+            # Do not let undecodable output hide the actual error
             if res.stdout:
-                msg += f'\n{res.stdout.decode()}'
+                msg += f'\n{res.stdout.decode(errors="replace")}'
             if res.stderr:
-                msg += f'\n{res.stderr.decode()}'
+                msg += f'\n{res.stderr.decode(errors="replace")}'
             raise RuntimeError(msg)
         if capture_output:
             return res.stdout.decode()
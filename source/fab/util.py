@@ -17,7 +17,7 @@ from argparse import ArgumentParser
 from collections import namedtuple, defaultdict
 from pathlib import Path
 from time import perf_counter
-from typing import Iterator, Iterable, Optional, Dict, Set, Union, List
+from typing import Callable, Iterator, Iterable, Optional, Dict, Set, Union, List
 
 import fab
 
@@ -76,7 +76,8 @@ def string_checksum(s: str):
     return zlib.crc32(s.encode())
 
 
-def file_walk(path: Union[str, Path], ignore_folders: Optional[List[Path]] = None) -> Iterator[Path]:
+def file_walk(path: Union[str, Path], ignore_folders: Optional[List[Path]] = None,
+              folder_filter: Optional[Callable[[Path], bool]] = None) -> Iterator[Path]:
     """
     Return every file in *path* and its sub-folders.
 
@@ -84,6 +85,8 @@ def file_walk(path: Union[str, Path], ignore_folders: Optional[List[Path]] = Non
         Folder to iterate.
     :param ignore_folders:
         Pass in any folder if you don't want to traverse into. Please see explanation and intended use, below.
+    :param folder_filter:
+        Optional function which is called for every sub-folder. The folder is not traversed if it returns False.
 
     .. note::
 
@@ -96,16 +99,26 @@ def file_walk(path: Union[str, Path], ignore_folders: Optional[List[Path]] = Non
     """
     path = Path(path)
     assert path.is_dir(), f"not dir: '{path}'"
-    ignore_folders = ignore_folders or []
+
+    yield from _file_walk(path, ignore_folders or [], folder_filter)
+
+
+def _file_walk(path: Path, ignore_folders: List[Path],
+               folder_filter: Optional[Callable[[Path], bool]]) -> Iterator[Path]:
+    # os.scandir caches the type of each entry, which saves a stat call per entry compared to Path.iterdir.
+    # The entries are read up front so that the folder is closed before recursing.
+    with os.scandir(path) as it:
+        entries = list(it)
 
     # Note: path here *can* be the prebuild folder
-    for i in path.iterdir():
-        if i.is_dir():
+    for entry in entries:
+        i = path / entry.name
+        if entry.is_dir():
             # Don't recurse into the given folders.
-            if i in ignore_folders:
+            if i in ignore_folders or (folder_filter and not folder_filter(i)):
                 logger.debug(f'file_walk ignoring {i}')
                 continue
-            yield from file_walk(path=i, ignore_folders=ignore_folders)
+            yield from _file_walk(i, ignore_folders, folder_filter)
         else:
             yield i
 
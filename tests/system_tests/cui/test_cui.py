@@ -8,6 +8,7 @@
 System tests for the fab command line utility.
 """
 
+import os
 import sys
 import pytest
 from pathlib import Path
@@ -238,3 +239,34 @@ class FabBuildInvalidName(FabTargetBase):
         captured = capsys.readouterr()
 
         assert "unable to import" in captured.err
+
+
+class TestImportFromPath:
+    """Test loading of build scripts by file path."""
+
+    def test_module_cache(self, tmp_path: Path, monkeypatch) -> None:
+        """Test an unchanged file is only loaded once."""
+
+        monkeypatch.chdir(tmp_path)
+        target = tmp_path / "FabFile"
+        target.write_text("value = 1\n")
+
+        first = fab.cui.__main__.import_from_path("builder", target)
+        second = fab.cui.__main__.import_from_path("builder", target)
+        assert first is not None
+        assert first is second
+        assert first.value == 1
+
+        # A modified file is loaded again
+        target.write_text("value = 2\n")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        third = fab.cui.__main__.import_from_path("builder", target)
+        assert third is not None
+        assert third is not first
+        assert third.value == 2
+
+        # No bytecode is written, neither next to the file nor into a
+        # default fab workspace in the current directory
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["FabFile"]
@@ -6,7 +6,6 @@
 """
 Tests the FabBase class
 """
-import inspect
 import os
 from pathlib import Path
 import sys
@@ -15,8 +14,10 @@ from unittest import mock
 import pytest
 
 from fab.build_config import AddFlags
-from fab.fab_base.fab_base import FabBase
+from fab.fab_base.fab_base import (_LazyStep, _tool_probe_key, FabBase,
+                                   TOOL_PROBE_CACHE)
 from fab.tools.category import Category
+from fab.tools.compiler_wrapper import Mpif90
 from fab.tools.tool_repository import ToolRepository
 
 
@@ -101,6 +102,25 @@ def test_site_platform(monkeypatch, arg) -> None:
     assert getattr(fab_base, attribute) == flag_list[1]
 
 
+@pytest.mark.parametrize("flag_list,attribute,value",
+                         [(["--plat", "foo"], "platform", "foo"),
+                          (["-pfoo"], "platform", "foo"),
+                          (["--sit", "bar"], "site", "bar"),
+                          (["--site=bar"], "site", "bar"),
+                          ])
+def test_site_platform_forms(monkeypatch, flag_list, attribute,
+                             value) -> None:
+    '''
+    Tests that the site and platform used to find the site-specific
+    config agree with the full command line parser, e.g. for abbreviated
+    options or attached values.
+    '''
+    monkeypatch.setattr(sys, "argv", ["fab_base.py"]+flag_list)
+    fab_base = FabBase(name="test-help")
+    assert getattr(fab_base, attribute) == value
+    assert getattr(fab_base.args, attribute) == value
+
+
 def test_arg_error(monkeypatch) -> None:
     '''
     Tests handling of errors in the command line.
@@ -112,11 +132,12 @@ def test_arg_error(monkeypatch) -> None:
             str(err.value))
 
 
-def test_available_compilers(monkeypatch, capsys) -> None:
+def test_available_compilers(monkeypatch, capsys, tmp_path: Path) -> None:
     '''
     Tests the list of available compilers.
     '''
-    monkeypatch.setattr(sys, "argv", ["fab_base.py", "--available-compilers"])
+    monkeypatch.setattr(sys, "argv", ["fab_base.py", "--available-compilers",
+                                      "--fab-workspace", str(tmp_path)])
     with pytest.raises(SystemExit):
         _ = FabBase(name="test-help")
     out, _ = capsys.readouterr()
@@ -126,6 +147,44 @@ def test_available_compilers(monkeypatch, capsys) -> None:
     assert "Linker - sln: scc" in out
 
 
+def test_available_compilers_cache(monkeypatch, capsys,
+                                   tmp_path: Path) -> None:
+    '''
+    Tests that the availability of tools is cached in the workspace.
+    '''
+    monkeypatch.setattr(sys, "argv", ["fab_base.py", "--available-compilers",
+                                      "--fab-workspace", str(tmp_path)])
+    # Pretend that all tools are installed as the Python interpreter
+    monkeypatch.setattr("fab.fab_base.fab_base.shutil.which",
+                        lambda _: sys.executable)
+    with pytest.raises(SystemExit):
+        _ = FabBase(name="test-help")
+    capsys.readouterr()
+    assert (tmp_path / TOOL_PROBE_CACHE).is_file()
+
+    # The cached result is used, even though the tool now reports
+    # that it is not available:
+    # pylint: disable=protected-access
+    fc = ToolRepository().get_tool(Category.FORTRAN_COMPILER,
+                                   "some Fortran compiler")
+    fc._is_available = False
+    with pytest.raises(SystemExit):
+        _ = FabBase(name="test-help")
+    out, _ = capsys.readouterr()
+    assert "FortranCompiler - some Fortran compiler: sfc" in out
+
+
+def test_tool_probe_key(monkeypatch, stub_fortran_compiler) -> None:
+    '''
+    Tests that compiler wrappers are not cached, since whether they work
+    depends on the environment.
+    '''
+    monkeypatch.setattr("fab.fab_base.fab_base.shutil.which",
+                        lambda _: sys.executable)
+    assert _tool_probe_key(stub_fortran_compiler) is not None
+    assert _tool_probe_key(Mpif90(stub_fortran_compiler)) is None
+
+
 def test_root_symbol(monkeypatch) -> None:
     '''
     Tests setting the root symbol(s).
@@ -288,6 +347,17 @@ def test_workspace(monkeypatch, change_into_tmpdir) -> None:
             f"some_Fortran_compiler" in str(project_dir))
 
 
+@pytest.mark.parametrize("cache_steps", [True, False])
+def test_cache_steps(monkeypatch, cache_steps) -> None:
+    '''
+    Tests that --cache-steps enables the step cache of the build config.
+    '''
+    argv = ["fab_base.py"] + (["--cache-steps"] if cache_steps else [])
+    monkeypatch.setattr(sys, "argv", argv)
+    fab_base = FabBase(name="test-name")
+    assert (fab_base.config.step_cache is not None) is cache_steps
+
+
 @pytest.mark.parametrize("arg", [(["--fflags", "fflag"], "fflags"),
                                  (["--cflags", "cflag"], "cflags"),
                                  (["--ldflags", "ldflag"], "ldflags"),
@@ -316,26 +386,36 @@ def test_site_specific_outside_dir(monkeypatch) -> None:
     settings.
     '''
     this_dir = Path(__file__).parent
+    monkeypatch.setattr(sys, "path", sys.path[:])
     old_path = sys.path[:]
     monkeypatch.setattr(sys, "argv", ["fab_base.py"])
-    _ = FabBase(name="test-help")
-    assert sys.path[2:] == old_path
+    fab_base = FabBase(name="test-help")
     assert str(this_dir / "site_specific") in sys.path[0]
     assert str(this_dir) in sys.path[1]
+    # The directories are moved to the front if they are already in the
+    # path, so the path does not grow when this is done again:
+    assert sys.path[2:] == [path for path in old_path
+                            if path not in sys.path[:2]]
+    new_path = sys.path[:]
+    fab_base.setup_site_specific_location()
+    assert sys.path == new_path
 
 
 def test_site_specific_inside_dir(monkeypatch) -> None:
     '''
     Tests site-specific settings if the call is initiated from the
-    same directory as FabBase. This is done by patching inspect
-    to return an empty list. In this case, only one directory
+    same directory as FabBase. This is done by patching the call
+    stack to be empty. In this case, only one directory
     should be added the search path
     '''
+    monkeypatch.setattr(sys, "path", sys.path[:])
     old_path = sys.path[:]
     monkeypatch.setattr(sys, "argv", ["fab_base.py"])
-    monkeypatch.setattr(inspect, "stack", lambda: [])
+    monkeypatch.setattr("fab.fab_base.fab_base._caller_directories",
+                        lambda: iter([]))
     _ = FabBase(name="test-help")
-    assert sys.path[1:] == old_path
+    assert sys.path[1:] == [path for path in old_path
+                            if path != "site_specific"]
     assert "site_specific" == sys.path[0]
 
 
@@ -495,3 +575,14 @@ def test_build_shared_lib(monkeypatch) -> None:
     mocks["link_shared_object"][1].assert_called_once_with(
         fab_base.config, output_fpath=str(workspace / 'libtest.so'),
         flags=[])
+
+
+def test_lazy_step() -> None:
+    '''
+    Tests that a lazy step imports the step function when called.
+    '''
+    # pylint: disable=protected-access
+    lazy = _LazyStep("os.path", "join")
+    assert lazy._step is None
+    assert lazy("a", "b") == os.path.join("a", "b")
+    assert lazy._step is os.path.join
@@ -0,0 +1,55 @@
+##############################################################################
+# (c) Crown copyright Met Office. All rights reserved.
+# For further details please refer to the file COPYRIGHT
+# which you should have received as part of this distribution
+##############################################################################
+"""
+Tests the find_source_files step.
+"""
+from pathlib import Path
+from unittest import mock
+
+from fab.artefacts import ArtefactSet, ArtefactStore
+from fab.steps.find_source_files import Exclude, find_source_files, Include
+from fab.util import file_walk
+
+
+class TestFindSourceFiles:
+    """
+    Tests the filtering of source files.
+    """
+    def _find(self, tmp_path: Path, path_filters):
+        source_root = tmp_path / 'source'
+        for name in ['src/a.f90', 'src/test/b.f90', 'src/test/keep.f90',
+                     'other/c.c']:
+            fpath = source_root / name
+            fpath.parent.mkdir(parents=True, exist_ok=True)
+            fpath.touch()
+
+        config = mock.Mock(source_root=source_root,
+                           prebuild_folder=tmp_path / 'prebuild',
+                           artefact_store=ArtefactStore())
+        with mock.patch('fab.steps.send_metric'):
+            find_source_files(config, path_filters=path_filters)
+        found = config.artefact_store[ArtefactSet.INITIAL_SOURCE_FILES]
+        return {str(fpath.relative_to(source_root)) for fpath in found}
+
+    def test_no_filter(self, tmp_path):
+        '''All files are found without filters.'''
+        assert self._find(tmp_path, None) == {
+            'src/a.f90', 'src/test/b.f90', 'src/test/keep.f90', 'other/c.c'}
+
+    def test_exclude_folder(self, tmp_path):
+        '''An excluded folder is not traversed.'''
+        with mock.patch('fab.steps.find_source_files.file_walk',
+                        wraps=file_walk) as walk:
+            found = self._find(tmp_path, [Exclude('/test/')])
+        assert found == {'src/a.f90', 'other/c.c'}
+        folder_filter = walk.call_args.kwargs['folder_filter']
+        assert not folder_filter(tmp_path / 'source' / 'src' / 'test')
+        assert folder_filter(tmp_path / 'source' / 'src')
+
+    def test_include_after_exclude(self, tmp_path):
+        '''A later Include can bring back files from an excluded folder.'''
+        found = self._find(tmp_path, [Exclude('/test/'), Include('keep')])
+        assert found == {'src/a.f90', 'src/test/keep.f90', 'other/c.c'}
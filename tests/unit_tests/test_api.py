@@ -10,7 +10,7 @@ which atm is v1 (i.e. fab.api and fab.v1 will export the same symbols).
 """
 
 from importlib import import_module
-from pytest import fail
+from pytest import fail, raises
 
 
 def test_import_from_api() -> None:
@@ -32,6 +32,7 @@ def test_import_from_api() -> None:
         "CompilerWrapper",
         "compile_c",
         "compile_fortran",
+        "cached_step",
         "c_pragma_injector",
         "Exclude",
         "fcm_export",
@@ -70,3 +71,16 @@ def test_import_from_api() -> None:
         except AttributeError:
             fail(f"Symbol `{symbol_name}` could not be imported "
                  f"from `fab.api`.")
+
+
+def test_unknown_symbol() -> None:
+    """
+    Test that accessing a symbol not in the API raises an AttributeError,
+    and that all API symbols are listed by dir().
+    """
+
+    fab_api = import_module("fab.api")
+    with raises(AttributeError) as err:
+        getattr(fab_api, "not_a_symbol")
+    assert "has no attribute 'not_a_symbol'" in str(err.value)
+    assert set(fab_api.__all__) <= set(dir(fab_api))
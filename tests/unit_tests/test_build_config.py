@@ -87,3 +87,17 @@ class TestBuildConfig:
         some_dir = Path('/some_dir')
         config = BuildConfig('proj', ToolBox(), fab_workspace=some_dir)
         assert config.project_workspace == some_dir / 'proj'
+
+    def test_step_cache(self, tmp_path: Path,
+                        stub_tool_repository: ToolRepository) -> None:
+        '''
+        Test that the step cache manifest is written when caching is on.
+        '''
+        config = BuildConfig('proj', ToolBox(), fab_workspace=tmp_path)
+        assert config.step_cache is None
+
+        with BuildConfig('proj', ToolBox(), fab_workspace=tmp_path,
+                         multiprocessing=False,
+                         cache_steps=True) as config:
+            assert config.step_cache is not None
+        assert (config.step_cache.folder / 'manifest.json').is_file()
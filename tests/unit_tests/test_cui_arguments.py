@@ -13,6 +13,7 @@ import sys
 import os
 import argparse
 from pathlib import Path
+from unittest import mock
 from fab.cui.arguments import full_path_type, FabArgumentParser
 
 import pytest
@@ -33,6 +34,21 @@ class TestFullPathType:
 
         assert str(full_path_type(".")).startswith("/")
 
+    def test_cwd(self, tmp_path: Path, monkeypatch):
+        """Check cached relative paths follow the working directory."""
+
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+
+        monkeypatch.chdir(first)
+        assert full_path_type("file") == first.resolve() / "file"
+        assert full_path_type("file") is full_path_type("file")
+
+        monkeypatch.chdir(second)
+        assert full_path_type("file") == second.resolve() / "file"
+
 
 class TestFabFile:
     """Check fab --file specific partial parsing."""
@@ -70,6 +86,20 @@ class TestFabFile:
         assert args.file.name == filename.name
         assert not args.zero_config
 
+    def test_default_checked_once(self, fs: FakeFilesystem):
+        """Check the default file is only looked up once."""
+
+        fs.create_file("FabFile")
+
+        parser = FabArgumentParser()
+        path_type = type(parser.fabfile)
+        with mock.patch.object(path_type, "is_file", autospec=True,
+                               side_effect=path_type.is_file) as is_file:
+            parser.parse_fabfile_only([])
+            args = parser.parse_args([])
+        assert is_file.call_count == 1
+        assert args.file.name == "FabFile"
+
     def test_nonexistent_default(self, fs: FakeFilesystem):
         """Check non-existent default file."""
 
@@ -115,6 +145,18 @@ class TestFabFile:
         captured = capsys.readouterr()
         assert "--file: expected one argument" in captured.err
 
+    def test_repeated(self, fs: FakeFilesystem):
+        """Check the fabfile can be parsed more than once."""
+
+        fs.create_file("myfile")
+
+        parser = FabArgumentParser()
+        args = parser.parse_fabfile_only(["--file", "myfile"])
+        assert args.file.name == "myfile"
+        args = parser.parse_fabfile_only([])
+        assert args.file is None
+        assert args.zero_config
+
     def test_no_help(self):
         """Check there the help option does nothing."""
 
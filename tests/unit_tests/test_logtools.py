@@ -238,3 +238,27 @@ def test_file_logging(tmp_path, caplog):
 
     assert "build info" in lines
     assert "build debug" in lines
+
+
+def test_repeated_setup(tmp_path, caplog):
+    """Check that repeated setup calls do not duplicate messages."""
+
+    first = StringIO()
+    second = StringIO()
+    setup_logging(1, 0, False, first)
+    setup_logging(1, 0, False, second)
+
+    logfile = tmp_path / "test.log"
+    setup_file_logging(logfile, name="fab")
+    setup_file_logging(logfile, name="fab")
+
+    logging.getLogger("fab.build").info("build info")
+
+    assert first.getvalue() == ""
+    assert second.getvalue().count("build info") == 1
+    assert logfile.read_text().count("build info") == 1
+
+    for handler in list(logging.getLogger("fab").handlers):
+        if isinstance(handler, logging.FileHandler):
+            logging.getLogger("fab").removeHandler(handler)
+            handler.close()
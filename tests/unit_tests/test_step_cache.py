@@ -0,0 +1,246 @@
+##############################################################################
+# (c) Crown copyright Met Office. All rights reserved.
+# For further details please refer to the file COPYRIGHT
+# which you should have received as part of this distribution
+##############################################################################
+"""
+Tests the step-level build cache.
+"""
+import os
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from fab.artefacts import ArtefactSet, ArtefactStore, SuffixFilter
+from fab.step_cache import MANIFEST_FILENAME, StepCache
+from fab.steps import cached_step
+from fab.tools.category import Category
+from fab.tools.tool import Tool
+from fab.tools.tool_box import ToolBox
+
+
+def _config(tmp_path: Path) -> SimpleNamespace:
+    '''A minimal config object for the step cache.'''
+    return SimpleNamespace(profile='', mpi=False, openmp=False,
+                           two_stage=False, tool_box=ToolBox(),
+                           artefact_store=ArtefactStore(),
+                           step_cache=StepCache(tmp_path / 'cache'))
+
+
+def _tool(name: str, category: Category) -> Tool:
+    '''A tool which is marked as available.'''
+    tool = Tool(name, name, category)
+    tool._is_available = True
+    return tool
+
+
+def _touch(fpath: Path):
+    '''Change the modification time of a file.'''
+    stat = fpath.stat()
+    os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+
+class TestStepCache:
+    '''Tests the StepCache class.'''
+
+    def test_fingerprint(self, tmp_path: Path):
+        '''The fingerprint depends on arguments and input files.'''
+        source = tmp_path / 'a.f90'
+        source.write_text('program a\nend program a\n')
+        config = _config(tmp_path)
+        config.artefact_store.add(ArtefactSet.INITIAL_SOURCE_FILES, source)
+        cache = config.step_cache
+
+        first = cache.fingerprint('step', config, (), {'flags': ['-O2']})
+        assert first is not None
+        assert first == cache.fingerprint('step', config, (),
+                                          {'flags': ['-O2']})
+        assert first != cache.fingerprint('step', config, (),
+                                          {'flags': ['-O3']})
+        assert first != cache.fingerprint('other', config, (),
+                                          {'flags': ['-O2']})
+
+        _touch(source)
+        assert first != cache.fingerprint('step', config, (),
+                                          {'flags': ['-O2']})
+
+    def test_tools(self, tmp_path: Path):
+        '''Only the tools used by a step are part of the fingerprint.'''
+        config = _config(tmp_path)
+        fpp = _tool('fpp', Category.FORTRAN_PREPROCESSOR)
+        config.tool_box.add_tool(fpp)
+        cache = config.step_cache
+
+        first = cache.fingerprint('step', config, (), {},
+                                  tools=[Category.FORTRAN_PREPROCESSOR])
+        # Another tool added to the tool box is ignored
+        config.tool_box.add_tool(_tool('ar', Category.AR))
+        assert first == cache.fingerprint(
+            'step', config, (), {}, tools=[Category.FORTRAN_PREPROCESSOR])
+        assert first != cache.fingerprint('step', config, (), {})
+
+    def test_profile_flags(self, tmp_path: Path):
+        '''The flags of the profile in use are part of the fingerprint.'''
+        config = _config(tmp_path)
+        config.profile = 'fast'
+        fpp = _tool('fpp', Category.FORTRAN_PREPROCESSOR)
+        fpp.define_profile('fast')
+        config.tool_box.add_tool(fpp)
+        cache = config.step_cache
+
+        def fingerprint():
+            return cache.fingerprint('step', config, (), {},
+                                     tools=[Category.FORTRAN_PREPROCESSOR])
+
+        first = fingerprint()
+        fpp.add_flags(['-O3'], 'fast')
+        assert first != fingerprint()
+
+    def test_callable(self, tmp_path: Path):
+        '''Functions are fingerprinted by their code and closure.'''
+        config = _config(tmp_path)
+        cache = config.step_cache
+
+        def make_getter(value, double):
+            if double:
+                def getter():
+                    return 2 * value
+            else:
+                def getter():
+                    return value
+            return getter
+
+        first = cache.fingerprint('step', config, (make_getter(1, False),),
+                                  {})
+        assert first == cache.fingerprint('step', config,
+                                          (make_getter(1, False),), {})
+        assert first != cache.fingerprint('step', config,
+                                          (make_getter(2, False),), {})
+        assert first != cache.fingerprint('step', config,
+                                          (make_getter(1, True),), {})
+
+    def test_partial(self, tmp_path: Path):
+        '''Partials are fingerprinted by their function and arguments.'''
+        config = _config(tmp_path)
+        cache = config.step_cache
+
+        def func(a, b=0):
+            return a + b
+
+        first = cache.fingerprint('step', config, (partial(func, 1),), {})
+        assert first == cache.fingerprint('step', config,
+                                          (partial(func, 1),), {})
+        assert first != cache.fingerprint('step', config,
+                                          (partial(func, 2),), {})
+        assert first != cache.fingerprint('step', config,
+                                          (partial(func, 1, b=1),), {})
+
+    def test_bound_method(self, tmp_path: Path):
+        '''Bound methods are fingerprinted by the object they are bound to.'''
+        config = _config(tmp_path)
+        cache = config.step_cache
+
+        def fingerprint(suffix):
+            getter = SuffixFilter(ArtefactSet.INITIAL_SOURCE_FILES, suffix)
+            return cache.fingerprint('step', config, (getter.__call__,), {})
+
+        first = fingerprint('.f90')
+        assert first == fingerprint('.f90')
+        assert first != fingerprint('.F90')
+
+    def test_uncacheable(self, tmp_path: Path):
+        '''Arguments without a stable representation disable caching.'''
+        config = _config(tmp_path)
+        cache = config.step_cache
+        assert cache.fingerprint('step', config, (object(),), {}) is None
+
+        # The state of other objects might not be held in their attributes
+        class Unknown:
+            def __init__(self, value):
+                self.value = value
+
+            def method(self):
+                return self.value
+
+        assert cache.fingerprint('step', config, (Unknown(1),), {}) is None
+        assert cache.fingerprint('step', config,
+                                 (Unknown(1).method,), {}) is None
+
+    def test_record_restore(self, tmp_path: Path):
+        '''A recorded snapshot is restored, and persists in the manifest.'''
+        output = tmp_path / 'a.o'
+        output.write_text('object')
+        config = _config(tmp_path)
+        config.artefact_store.add(ArtefactSet.EXECUTABLES, output)
+        config.step_cache.record('step', 'abc', config.artefact_store)
+        config.step_cache.save()
+        assert (tmp_path / 'cache' / MANIFEST_FILENAME).is_file()
+
+        store = ArtefactStore()
+        cache = StepCache(tmp_path / 'cache')
+        assert not cache.restore('unknown', store)
+        assert cache.restore('abc', store)
+        assert store[ArtefactSet.EXECUTABLES] == {output}
+
+        # A modified output invalidates the snapshot
+        _touch(output)
+        assert not cache.restore('abc', ArtefactStore())
+
+    def test_prune(self, tmp_path: Path):
+        '''The least recently used snapshots are removed.'''
+        cache = StepCache(tmp_path / 'cache', max_entries=2)
+        store = ArtefactStore()
+        cache.record('step', 'a', store)
+        cache.record('step', 'b', store)
+        assert cache.restore('a', ArtefactStore())
+
+        cache.record('step', 'c', store)
+        assert not (tmp_path / 'cache' / 'b.pickle').exists()
+        assert not cache.restore('b', ArtefactStore())
+        assert cache.restore('a', ArtefactStore())
+        assert cache.restore('c', ArtefactStore())
+
+
+class TestCachedStep:
+    '''Tests the cached_step decorator.'''
+
+    def test_skip_unchanged(self, tmp_path: Path):
+        '''The step only runs again if its inputs change.'''
+        output = tmp_path / 'out.txt'
+        calls = []
+
+        @cached_step
+        def my_step(config, text):
+            calls.append(text)
+            output.write_text(text)
+            config.artefact_store.add(ArtefactSet.EXECUTABLES, output)
+
+        config = _config(tmp_path)
+        with mock.patch('fab.steps.send_metric'):
+            my_step(config, 'hello')
+            assert calls == ['hello']
+
+            # Same inputs, the artefacts are restored from the cache
+            config.artefact_store.reset()
+            my_step(config, 'hello')
+            assert calls == ['hello']
+            assert config.artefact_store[ArtefactSet.EXECUTABLES] == {output}
+
+            # Different arguments
+            config.artefact_store.reset()
+            my_step(config, 'bye')
+            assert calls == ['hello', 'bye']
+
+    def test_no_cache(self):
+        '''Without a step cache, the step always runs.'''
+        calls = []
+
+        @cached_step
+        def my_step(config):
+            calls.append(config)
+
+        with mock.patch('fab.steps.send_metric'):
+            my_step(None)
+            my_step(config=None)
+        assert calls == [None, None]
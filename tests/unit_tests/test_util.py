@@ -57,6 +57,13 @@ class Test_file_walk():
         result = list(file_walk(tmp_path / 'foo', ignore_folders=[pbf.parent]))
         assert result == [f]
 
+    def test_folder_filter(self, files, tmp_path):
+        f, pbf = files
+
+        result = list(file_walk(tmp_path / 'foo',
+                                folder_filter=lambda folder: folder.name != '_prebuild'))
+        assert result == [f]
+
 
 class Test_input_to_output_fpath(object):
 
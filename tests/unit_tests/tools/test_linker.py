@@ -199,6 +199,24 @@ class TestLinkerLinking:
         ]
 
 
+def test_c_with_response_file(stub_c_compiler: CCompiler,
+                              stub_configuration: BuildConfig,
+                              subproc_record: ExtendedRecorder,
+                              tmp_path: Path) -> None:
+    """
+    Tests the input files are passed in a response file.
+    """
+    linker = Linker(compiler=stub_c_compiler)
+    response_file = tmp_path / "link" / "a.rsp"
+    linker.link([Path("b.o"), Path("my dir/a.o")], Path("a.out"),
+                config=stub_configuration, libs=[],
+                response_file=response_file)
+    assert subproc_record.invocations() == [
+        ['scc', f"@{response_file}", "-o", "a.out"]
+    ]
+    assert response_file.read_text() == "b.o\nmy\\ dir/a.o\n"
+
+
 def test_c_with_libraries(stub_c_compiler: CCompiler,
                           stub_configuration: BuildConfig,
                           subproc_record: ExtendedRecorder) -> None:
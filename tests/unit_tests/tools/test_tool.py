@@ -208,6 +208,17 @@ class TestToolRun:
                                   "['tool']\nBeef.")
         assert call_list(fake_process) == [['tool']]
 
+    def test_error_undecodable(self, fake_process: FakeProcess) -> None:
+        """
+        Tests a failing tool with output that is not valid UTF-8.
+        """
+        fake_process.register(['tool'], returncode=1, stderr=b"Beef\xff.")
+        tool = Tool("some tool", "tool", Category.MISC)
+        with raises(RuntimeError) as err:
+            tool.run()
+        assert str(err.value) == ("Command failed with return code 1:\n"
+                                  "['tool']\nBeef\ufffd.")
+
     def test_error_file_not_found(self, fake_process: FakeProcess) -> None:
         """
         Tests running a missing tool.